@@ -0,0 +1,156 @@
+"""
+Benchmark reproductible du crawler sur un corpus de pages enregistré.
+
+    python benchmark.py record "minecraft shorts" --pages 300
+    python benchmark.py run "minecraft shorts" --output bench.json
+
+Le mode record crawle le site réel et enregistre les pages de recherche et
+de vidéo dans une archive ; le mode run rejoue cette archive sans réseau et
+mesure pages/s, temps d'analyse par page, vidéos trouvées par requête et pic
+mémoire pour crawl() et stream_crawl().
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from src.crawlers import YoutubeCrawler
+from src.fixtures import FixtureArchive, install_recorder, install_replay
+
+FIXTURES_DIR = "src/media/fixtures"
+# Filtres fixes (sans date relative) pour que les résultats restent comparables
+BENCH_FILTERS = {
+    "duration": {"min": 15, "max": 175},
+    "views": {"min": 100000},
+}
+CRAWL_SIZE = 50  # Vidéos demandées à crawl()
+
+
+def fixture_path(query):
+    name = query.strip().lower().replace(" ", "_")
+    return os.path.join(FIXTURES_DIR, f"{name}.json.gz")
+
+
+def new_crawler(parse_workers=0, **kwargs):
+    """Crawler isolé : sans cache disque ni vidéos déjà uploadées"""
+    return YoutubeCrawler(cache=None, parse_workers=parse_workers, registry=False, **kwargs)
+
+
+def record(query, pages, search_pages):
+    """Crawle le site réel sans filtre et enregistre les `pages` premières pages"""
+    archive = FixtureArchive(fixture_path(query))
+    crawler = new_crawler()
+    install_recorder(crawler.transport, archive)
+    stream = crawler.stream_crawl(query, None, search_pages=search_pages)
+    try:
+        # Sans filtre chaque nouvelle vidéo est retournée : le budget est vérifié souvent
+        for _ in stream:
+            if crawler.transport.stats.requests >= pages:
+                break
+    finally:
+        stream.close()
+        crawler.close()
+    archive.save()
+    print(f"{len(archive)} réponses enregistrées dans {archive.path}")
+
+
+def _scenarios(query, search_pages):
+    """Scénarios mesurés : (nom, options du crawler, fonction de crawl)"""
+    return [
+        ("crawl", {}, lambda c: c.crawl(query, CRAWL_SIZE, BENCH_FILTERS, search_pages=search_pages)),
+        ("stream_crawl", {}, lambda c: list(c.stream_crawl(query, BENCH_FILTERS, search_pages=search_pages))),
+        ("stream_crawl_best_first", {}, lambda c: list(c.stream_crawl(query, BENCH_FILTERS, frontier="best_first",
+                                                                      search_pages=search_pages))),
+        ("stream_crawl_x8", {"pool_size": 8}, lambda c: list(c.stream_crawl(query, BENCH_FILTERS, concurrency=8,
+                                                                             search_pages=search_pages))),
+    ]
+
+
+def _run_once(archive, options, run, latency, parse_workers, trace_memory):
+    crawler = new_crawler(parse_workers=parse_workers, rate_limiter=False, **options)
+    replay = install_replay(crawler.transport, archive, latency)
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        run(crawler)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        crawler.close()
+    return crawler, replay, elapsed, peak
+
+
+def benchmark(query, search_pages, latency, parse_workers, repeat):
+    """
+    Rejoue l'archive de la requête pour chaque scénario.
+
+    Le temps est le meilleur de `repeat` passes sans tracemalloc ; le pic
+    mémoire (processus principal uniquement) est mesuré par une passe dédiée.
+
+    Returns:
+        dict: Métriques par scénario
+    """
+    archive = FixtureArchive.load(fixture_path(query))
+    results = {}
+    for name, options, run in _scenarios(query, search_pages):
+        best = None
+        for _ in range(repeat):
+            crawler, replay, elapsed, _ = _run_once(archive, options, run, latency, parse_workers, False)
+            if best is None or elapsed < best[2]:
+                best = (crawler, replay, elapsed)
+        crawler, replay, elapsed = best
+        _, _, _, peak = _run_once(archive, options, run, latency, parse_workers, True)
+
+        stats = crawler.crawl_stats()
+        results[name] = {
+            "seconds": round(elapsed, 3),
+            "requests": stats["requests"],
+            # Les pages absentes du corpus échouent sans coût : seules les pages rejouées comptent
+            "pages": replay.hits,
+            "pages_per_second": round(replay.hits / elapsed, 1) if elapsed else 0.0,
+            "parse_ms_per_page": round(stats["parse"]["avg_ms"], 3),
+            "matches": stats["matches"],
+            "matches_per_request": round(stats["matches_per_request"], 4),
+            "peak_memory_kb": round(peak / 1024),
+            "replay_misses": replay.misses,
+        }
+    return results
+
+
+def print_results(results):
+    columns = ["seconds", "requests", "pages", "pages_per_second", "parse_ms_per_page",
+               "matches", "matches_per_request", "peak_memory_kb", "replay_misses"]
+    print(f"{'scénario':<26}" + "".join(f"{column:>20}" for column in columns))
+    for name, metrics in results.items():
+        print(f"{name:<26}" + "".join(f"{metrics[column]:>20}" for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du crawler sur un corpus enregistré")
+    parser.add_argument("mode", choices=["record", "run"])
+    parser.add_argument("query")
+    parser.add_argument("--pages", type=int, default=300, help="Budget de requêtes enregistrées (record)")
+    parser.add_argument("--search-pages", type=int, default=3, help="Pages de résultats de recherche")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par requête rejouée (s)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processus d'analyse des pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes chronométrées par scénario")
+    parser.add_argument("--output", help="Fichier JSON où écrire les métriques")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        record(args.query, args.pages, args.search_pages)
+        return
+
+    results = benchmark(args.query, args.search_pages, args.latency, args.parse_workers, args.repeat)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
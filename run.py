@@ -1,11 +1,16 @@
 from src.crawlers import YoutubeCrawler
+from src.cache import PageCache, MediaCache
+from src.frontier_store import SQLiteFrontierStore, SharedFrontier
+from src.enrichment import MetadataCache
+from src.registry import UploadRegistry
 from datetime import datetime, timedelta
-from src.downloader import YouTubeDownloader
+from src.downloader import DownloadPool, DownloadSession, TargetProfile
 from src.editor import Editor
 from src.uploader import YouTubeUploader
 import os
 import time
 import json
+from contextlib import closing
 import googleapiclient.errors
 import googleapiclient.http
 from rich.console import Console
@@ -14,11 +19,40 @@ from rich.console import Console
 YOUTUBE_ACCOUNT = "bloky"
 MEDIA_DIR = "src/media/videos/"
 MAX_VIDEOS = 1
+CRAWL_CONCURRENCY = 4  # Pages vidéo téléchargées en parallèle pendant le crawl
+CRAWL_FRONTIER = "best_first"  # Ordre d'exploration : "fifo" ou "best_first"
+SEARCH_PAGES = 5  # Pages de résultats de recherche suivies par continuation
+CRAWL_EXPANSIONS = ("related", "channel")  # Vidéos connexes et moisson des chaînes ayant donné un résultat
+CHANNEL_PAGES = 5  # Requêtes par chaîne moissonnée (onglets, continuations, playlists)
+RESUME_CRAWL = True  # Reprendre le crawl depuis le dernier point de reprise
+SHARED_FRONTIER_DB = None  # Ex. "src/media/frontier.db" : frontière partagée par plusieurs run.py sur la même requête
+SEEN_SET = "set"  # "compact" ou "bloom" pour réduire la mémoire des très longs crawls
+DOWNLOAD_WORKERS = 3  # Téléchargements yt-dlp simultanés
+MAX_DOWNLOAD_BANDWIDTH = None  # Débit total des téléchargements en octets/s (None : illimité)
+MIN_DOWNLOAD_SPEED = 50_000  # Débit minimal d'un téléchargement (octets/s sur 10 s) avant de le relancer
+DOWNLOAD_STALL_TIMEOUT = 30  # Secondes sans donnée reçue avant de relancer un téléchargement
+DOWNLOAD_STALL_RETRIES = 1  # Relances d'un téléchargement bloqué avant de passer à la vidéo suivante
+DOWNLOAD_PLAYER_SKIP = False  # yt-dlp sans page vidéo ni données initiales (plus rapide, mais formats parfois manquants)
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Processus d'analyse des pages (0 : dans le processus courant)
 PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOADED_VIDEOS_FILE = "src/media/uploaded_videos.json"
+UPLOADED_VIDEOS_FILE = "src/media/uploaded_videos.json"  # Ancien registre JSON, importé une fois dans REGISTRY_PATH
+REGISTRY_PATH = "src/media/registry.db"  # Registre des vidéos uploadées (ajouts indexés)
+PAGE_CACHE_DIR = "src/media/cache/pages"  # Cache disque des pages de recherche et de vidéo
+MEDIA_CACHE_DIR = "src/media/cache/videos"  # Vidéos téléchargées, réutilisées en cas d'échec d'édition ou d'upload
+MEDIA_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # Budget disque du cache de vidéos (éviction LRU)
+YTDLP_CACHE_DIR = "src/media/cache/yt-dlp"  # Cache yt-dlp (player, signatures) conservé entre les lancements
+OUTPUT_HEIGHT = None  # Hauteur des montages en pixels (None : celle de la vidéo source, format 'best[ext=mp4]/best')
+DOWNLOAD_PROFILE = TargetProfile.for_height(OUTPUT_HEIGHT, vcodec="h264")  # Plus petit format suffisant pour l'édition
+CLIP_MAX_DURATION = None  # Durée maximale du montage en secondes : seul ce début est téléchargé, via ffmpeg (détection des blocages dégradée) (None : vidéo entière)
+ENRICH_METADATA = True  # Compléter durée et date exacte des shorts et des dates ambiguës avant filtrage (False : une vidéo sans durée passe filters["duration"]["min"])
+YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")  # Clé API Data (lots de 50) ; sans clé, une requête par vidéo
+METADATA_CACHE_PATH = "src/media/cache/metadata.db"  # Cache persistant des métadonnées complétées
 
 # Requête de recherche
 query = "minecraft shorts"
+# Requêtes supplémentaires crawlées en parallèle (résultats entrelacés, doublons fusionnés)
+extra_queries = []
+MIN_QUERY_YIELD = 0.02  # Rendement (vidéos trouvées par requête HTTP) sous lequel une requête est abandonnée
 filters = {
     "duration": {"min": 15, "max": 175},
     "views": {"min": 1000000, "max": 1000000000},
@@ -38,6 +72,10 @@ buffer_videos = []
 uploaded_videos = []
 failed_videos = []
 
+# Registre des vidéos déjà uploadées (partagé avec le crawler), ouvert par main() : les processus
+# d'analyse ("spawn") réimportent ce module et ne doivent pas ouvrir la base
+registry = None
+
 def get_tokens_path(account_name):
     return os.path.join(PROJECT_DIR, "accounts", account_name, "tokens.json")
 
@@ -117,26 +155,29 @@ def upload_to_youtube(youtube_service, video_path, title, description, tags, pri
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def process_video(youtube_service, video):
+def process_video(youtube_service, video, video_download):
     current_video = video.copy()
     
     console.print("\n[bold cyan]Traitement:[/bold cyan] " + current_video['title'])
-    console.print("[bold]Téléchargement...[/bold]")
-    
-    video_download = YouTubeDownloader().download(current_video['url'])
     
     if not video_download['success']:
-        console.print("[bold red]✗ Échec du téléchargement[/bold red]")
-        current_video["error"] = "Échec du téléchargement"
+        # Téléchargement bloqué (débit minimal non atteint après les relances) : vidéo ignorée
+        error = "Échec du téléchargement (trop lent)" if video_download.get('stalled') else "Échec du téléchargement"
+        console.print(f"[bold red]✗ {error}[/bold red]")
+        current_video["error"] = error
         failed_videos.append(current_video)
         return False
     
-    download_id = video_download['download_id']
-    console.print("[bold green]✓ Téléchargement terminé[/bold green]")
+    if video_download.get('cache_hit'):
+        console.print("[bold green]✓ Téléchargement terminé[/bold green] [cyan](cache)[/cyan]")
+    else:
+        console.print("[bold green]✓ Téléchargement terminé[/bold green]")
     
     console.print("[bold]Édition...[/bold]")
     try:
-        edited_video_id = Editor.add_entertainment_video(download_id)
+        edited_video_id = Editor.add_entertainment_video(video_download['path'], duration=CLIP_MAX_DURATION,
+                                                         keep_source=video_download.get('cached', False),
+                                                         height=OUTPUT_HEIGHT)
         console.print(f"[bold green]✓ Édition terminée[/bold green] [bold cyan]ID: {edited_video_id}[/bold cyan]")
     except Exception as e:
         console.print(f"[bold red]✗ Échec de l'édition[/bold red]")
@@ -181,27 +222,12 @@ def process_video(youtube_service, video):
         current_video["youtube_url"] = upload_result["url"]
         uploaded_videos.append(current_video)
         
-        # Ajouter l'ID YouTube au fichier de vidéos uploadées
+        # Ajouter l'ID YouTube au registre des vidéos uploadées
         try:
-            # Charger le fichier existant
-            uploaded_data = {"videos": []}
-            if os.path.exists(UPLOADED_VIDEOS_FILE):
-                with open(UPLOADED_VIDEOS_FILE, "r") as f:
-                    uploaded_data = json.load(f)
-            
-            # Ajouter la nouvelle vidéo
-            uploaded_data["videos"].append({
-                "videoId": current_video.get("youtube_id", ""),
-                "uploadedId": upload_result["video_id"]
-            })
-            
-            # Sauvegarder le fichier
-            with open(UPLOADED_VIDEOS_FILE, "w") as f:
-                json.dump(uploaded_data, f, indent=4)
-            
-            console.print("[bold green]✓ ID YouTube ajouté à uploaded_videos.json[/bold green]")
+            registry.add(current_video.get("youtube_id", ""), upload_result["video_id"], current_video.get("title"))
+            console.print("[bold green]✓ ID YouTube ajouté au registre des vidéos uploadées[/bold green]")
         except Exception as e:
-            console.print(f"[bold yellow]⚠ Erreur lors de l'ajout à uploaded_videos.json: {str(e)}[/bold yellow]")
+            console.print(f"[bold yellow]⚠ Erreur lors de l'ajout au registre des vidéos uploadées: {str(e)}[/bold yellow]")
         
         # Supprimer le fichier vidéo
         try:
@@ -235,44 +261,111 @@ def display_summary():
             console.print(f"  {i}. {truncate_text(video['title'], 60)} [Erreur: {truncate_text(video.get('error', 'Erreur'), 40)}]")
 
 def main():
+    global registry
     youtube_service = init_youtube_service()
     if not youtube_service:
         return
+    registry = UploadRegistry(REGISTRY_PATH, UPLOADED_VIDEOS_FILE)
     
     try:
         console.print("[bold cyan]RECHERCHE DE VIDÉOS[/bold cyan]")
         
-        youtube_crawler = YoutubeCrawler()
+        youtube_crawler = YoutubeCrawler(cache=PageCache(PAGE_CACHE_DIR), seen_set=SEEN_SET,
+                                         parse_workers=PARSE_WORKERS, enrich_metadata=ENRICH_METADATA,
+                                         metadata_api_key=YOUTUBE_API_KEY,
+                                         metadata_cache=MetadataCache(METADATA_CACHE_PATH), registry=registry)
         
-        for video in youtube_crawler.stream_crawl(query, filters):
-            video_info = {
-                "title": video['title'],
-                "url": video['url'],
-                "thumbnail": video['thumbnail'],
-                "youtube_id": video['videoId']
-            }
-            buffer_videos.append(video_info)
-            
-            console.print(f"Trouvé: {truncate_text(video['title'], 60)}")
-            
-            if len(buffer_videos) >= MAX_VIDEOS:
-                console.print(f"[yellow]Limite de {MAX_VIDEOS} vidéos atteinte.[/yellow]")
-                break
+        try:
+            # closing() garantit la sauvegarde du point de reprise, même sur interruption
+            if extra_queries:
+                stream = youtube_crawler.multi_stream_crawl([query] + extra_queries, filters, frontier=CRAWL_FRONTIER,
+                                                            search_pages=SEARCH_PAGES, min_yield=MIN_QUERY_YIELD)
+            else:
+                frontier = CRAWL_FRONTIER
+                if SHARED_FRONTIER_DB:
+                    frontier = SharedFrontier(SQLiteFrontierStore(SHARED_FRONTIER_DB), query, ordering=CRAWL_FRONTIER)
+                stream = youtube_crawler.stream_crawl(query, filters, concurrency=CRAWL_CONCURRENCY, frontier=frontier,
+                                                      search_pages=SEARCH_PAGES, resume=RESUME_CRAWL,
+                                                      expansions=CRAWL_EXPANSIONS, channel_pages=CHANNEL_PAGES)
+            with closing(stream):
+                for video in stream:
+                    # Réservation atomique : deux run.py en parallèle ne traitent jamais la même vidéo
+                    if not registry.reserve(video['videoId']):
+                        console.print(f"[yellow]Déjà prise par un autre processus:[/yellow] {truncate_text(video['title'], 60)}")
+                        continue
+                    video_info = {
+                        "title": video['title'],
+                        "url": video['url'],
+                        "thumbnail": video['thumbnail'],
+                        "youtube_id": video['videoId'],
+                        "duration": video['duration']
+                    }
+                    buffer_videos.append(video_info)
+                
+                    console.print(f"Trouvé: {truncate_text(video['title'], 60)}")
+                
+                    if len(buffer_videos) >= MAX_VIDEOS:
+                        console.print(f"[yellow]Limite de {MAX_VIDEOS} vidéos atteinte.[/yellow]")
+                        break
+        
+            crawl_stats = youtube_crawler.crawl_stats()
+            console.print(f"[cyan]Crawl:[/cyan] {crawl_stats['requests']} requêtes, "
+                          f"{crawl_stats['matches_per_request']:.2f} vidéos trouvées par requête, "
+                          f"analyse {crawl_stats['parse']['avg_ms']:.1f} ms/page")
+        finally:
+            youtube_crawler.close()
         
         display_summary()
         
         console.print("\n[bold cyan]TRAITEMENT DES VIDÉOS[/bold cyan]")
         
-        while buffer_videos:
-            video = buffer_videos.pop(0)
-            process_success = process_video(youtube_service, video)
+        # Tous les téléchargements sont lancés d'avance ; chaque vidéo est éditée et uploadée dès qu'elle est prête
+        download_pool = DownloadPool(DOWNLOAD_WORKERS, MAX_DOWNLOAD_BANDWIDTH,
+                                     media_cache=MediaCache(MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_BYTES),
+                                     session=DownloadSession(YTDLP_CACHE_DIR), profile=DOWNLOAD_PROFILE,
+                                     min_speed=MIN_DOWNLOAD_SPEED, stall_timeout=DOWNLOAD_STALL_TIMEOUT,
+                                     stall_retries=DOWNLOAD_STALL_RETRIES, player_skip=DOWNLOAD_PLAYER_SKIP)
+        try:
+            videos_by_download = {}
+            while buffer_videos:
+                video = buffer_videos.pop(0)
+                # Prolonger la réservation avant le téléchargement (reprise par un autre processus si expirée)
+                if not registry.reserve(video["youtube_id"]):
+                    console.print(f"[yellow]Réservation perdue, vidéo ignorée:[/yellow] {truncate_text(video['title'], 60)}")
+                    continue
+                # Durée connue du crawl : seul le début utile est téléchargé
+                section = None
+                if CLIP_MAX_DURATION and (video['duration'] or 0) > CLIP_MAX_DURATION:
+                    section = (0, CLIP_MAX_DURATION)
+                download_id = download_pool.submit(video['url'], video_id=video['youtube_id'], section=section)
+                videos_by_download[download_id] = video
+            console.print(f"[bold]Téléchargement de {len(videos_by_download)} vidéo(s)...[/bold]")
             
-            # Recharger la liste des vidéos déjà téléchargées pour éviter les doublons
-            if process_success:
-                console.print("[cyan]Mise à jour de la liste des vidéos téléchargées...[/cyan]")
-                youtube_crawler.reload_uploaded_videos()
+            for video_download in download_pool.results():
+                video = videos_by_download[video_download['download_id']]
+                try:
+                    process_success = process_video(youtube_service, video, video_download)
+                finally:
+                    # Après un upload, registry.add a déjà levé la réservation ; après un échec, elle est libérée
+                    registry.release(video["youtube_id"])
                 
-            display_summary()
+                # Recharger la liste des vidéos déjà téléchargées pour éviter les doublons
+                if process_success:
+                    console.print("[cyan]Mise à jour de la liste des vidéos téléchargées...[/cyan]")
+                    youtube_crawler.reload_uploaded_videos()
+                    
+                display_summary()
+            
+            download_stats = download_pool.stats()
+            transfer = download_stats['transfer']
+            console.print(f"[cyan]Téléchargements:[/cyan] {download_stats['bytes_downloaded'] / 1e6:.1f} Mo, "
+                          f"{download_stats['bytes_saved'] / 1e6:.1f} Mo économisés par rapport à 'best', "
+                          f"{transfer['throughput_bps'] / 1e6:.2f} Mo/s, premier octet {transfer['avg_ttfb_ms']:.0f} ms, "
+                          f"{transfer['stalls']} blocage(s)")
+        finally:
+            # Interruption : les téléchargements encore en file sont annulés
+            download_pool.close(cancel_pending=True)
+            download_pool.session.close()
         
         console.print("\n[bold green]TRAITEMENT TERMINÉ ![/bold green]")
         
@@ -280,6 +373,10 @@ def main():
         console.print("\n[bold yellow]Interruption manuelle détectée.[/bold yellow]")
     except Exception as e:
         console.print(f"\n[bold red]Erreur: {str(e)}[/bold red]")
+    finally:
+        # Libérer les vidéos réservées mais non traitées (interruption, erreur)
+        registry.release_all()
+        registry.close()
 
 if __name__ == "__main__":
     main()
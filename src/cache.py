@@ -0,0 +1,298 @@
+"""Caches disque des pages HTTP (corps compressés, TTL) et des vidéos téléchargées, avec éviction LRU"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    Cache persistant de corps de pages, indexé par URL.
+
+    Chaque entrée est un fichier zlib nommé d'après le hash de l'URL. La date
+    de modification du fichier est la date de stockage (pour le TTL), sa date
+    d'accès est mise à jour à chaque lecture (pour l'ordre LRU), si bien que
+    l'index en mémoire se reconstruit au démarrage par simple parcours du dossier.
+    """
+
+    def __init__(self, cache_dir="src/media/cache/pages", max_bytes=200 * 1024 * 1024, compression_level=6):
+        """
+        Args:
+            cache_dir (str): Dossier de stockage
+            max_bytes (int): Budget disque (taille compressée) au-delà duquel on évince
+            compression_level (int): Niveau de compression zlib
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # clé -> taille compressée, du moins au plus récemment utilisé
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self.bytes_written = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".zz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_atime, name[:-3], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".zz")
+
+    def get(self, url, ttl):
+        """
+        Retourne le corps en cache s'il a moins de `ttl` secondes.
+
+        Returns:
+            bytes|None: Le corps décompressé, ou None (absent ou expiré)
+        """
+        key = self.key(url)
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+        # Lecture et décompression hors du verrou : les lectures concurrentes ne s'attendent pas
+        # (put remplace le fichier atomiquement, une éviction concurrente donne une OSError)
+        body = None
+        expired = False
+        try:
+            stored_at = os.stat(path).st_mtime
+            expired = time.time() - stored_at > ttl
+            if not expired:
+                with open(path, "rb") as f:
+                    body = zlib.decompress(f.read())
+                # L'accès compte pour l'ordre LRU, la date de stockage reste inchangée
+                os.utime(path, (time.time(), stored_at))
+        except (OSError, zlib.error):
+            body = None
+        with self._lock:
+            if body is None:
+                if expired:
+                    self.expired += 1
+                self.misses += 1
+                self._remove(key)
+                return None
+            if key in self._index:
+                self._index.move_to_end(key)
+            self.hits += 1
+            self.bytes_served += len(body)
+            return body
+
+    def put(self, url, body):
+        """Stocke le corps d'une page puis évince les entrées les moins récemment utilisées"""
+        key = self.key(url)
+        path = self._path(key)
+        data = zlib.compress(body, self.compression_level)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError:
+                return
+            self.total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self.total_bytes += len(data)
+            self.bytes_written += len(data)
+            while self.total_bytes > self.max_bytes and len(self._index) > 1:
+                oldest = next(iter(self._index))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes_on_disk": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+                "bytes_written": self.bytes_written,
+            }
+
+
+class MediaCache:
+    """
+    Cache disque des vidéos téléchargées, adressé par identifiant vidéo et format.
+
+    Chaque fichier est nommé `{videoId}.{hash du format}.{ext}` : une vidéo
+    déjà téléchargée dans le même format (échec d'édition ou d'upload, nouvelle
+    édition) est resservie sans accès réseau. Comme pour PageCache, la date
+    d'accès des fichiers donne l'ordre LRU et l'index se reconstruit au
+    démarrage par parcours du dossier.
+    """
+
+    # Fichiers du cache (les fichiers partiels de yt-dlp, .part et .ytdl, sont ignorés)
+    _NAME = re.compile(r"^([\w-]+)\.([0-9a-f]{10})\.(\w+)$")
+
+    def __init__(self, cache_dir="src/media/cache/videos", max_bytes=2 * 1024 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str): Dossier de stockage
+            max_bytes (int): Budget disque au-delà duquel on évince
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # clé -> (chemin, taille), du moins au plus récemment utilisé
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self.bytes_written = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            match = self._NAME.match(name)
+            if not match:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_atime, f"{match.group(1)}.{match.group(2)}", path, stat.st_size))
+        for _, key, path, size in sorted(entries):
+            self._index[key] = (path, size)
+            self.total_bytes += size
+
+    @staticmethod
+    def format_key(video_format):
+        return hashlib.sha1(video_format.encode('utf-8')).hexdigest()[:10]
+
+    @classmethod
+    def key(cls, video_id, video_format):
+        return f"{video_id}.{cls.format_key(video_format)}"
+
+    def output_template(self, video_format):
+        """
+        Modèle de nom de fichier yt-dlp (outtmpl) pour écrire directement dans le cache.
+
+        Le même pour toutes les vidéos d'un format (%(id)s est l'identifiant
+        YouTube), pour que les options yt-dlp restent identiques d'un
+        téléchargement à l'autre.
+        """
+        return os.path.join(self.cache_dir, f"%(id)s.{self.format_key(video_format)}.%(ext)s")
+
+    def get(self, video_id, video_format):
+        """
+        Returns:
+            str|None: Chemin du fichier en cache, ou None
+        """
+        key = self.key(video_id, video_format)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or not os.path.exists(entry[0]):
+                self.misses += 1
+                if entry is not None:
+                    self.total_bytes -= self._index.pop(key)[1]
+                return None
+            path, size = entry
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._index.move_to_end(key)
+            self.hits += 1
+            self.bytes_served += size
+            return path
+
+    def put(self, video_id, video_format, path):
+        """Enregistre un fichier écrit dans le cache puis évince les entrées les moins récemment utilisées"""
+        key = self.key(video_id, video_format)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+                if previous[0] != path:
+                    self._remove_file(previous[0])
+            self._index[key] = (path, size)
+            self.total_bytes += size
+            self.bytes_written += size
+            while self.total_bytes > self.max_bytes and len(self._index) > 1:
+                oldest = next(iter(self._index))
+                oldest_path, oldest_size = self._index.pop(oldest)
+                self.total_bytes -= oldest_size
+                self._remove_file(oldest_path)
+                self.evictions += 1
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for path, _ in self._index.values():
+                self._remove_file(path)
+            self._index.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes_on_disk": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+                "bytes_written": self.bytes_written,
+            }
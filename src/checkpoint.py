@@ -0,0 +1,83 @@
+"""Sauvegarde et reprise de l'état d'un crawl (frontière et vidéos vues)"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from src.video import video_to_json
+
+CHECKPOINT_VERSION = 1
+
+
+class CrawlCheckpoint:
+    """
+    Point de reprise d'un crawl, stocké en JSON compressé (gzip).
+
+    L'écriture passe par un fichier temporaire renommé atomiquement, si bien
+    qu'un arrêt brutal pendant la sauvegarde laisse le point précédent intact.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.saves = 0
+
+    @classmethod
+    def for_query(cls, query, checkpoint_dir="src/media/checkpoints"):
+        """Point de reprise par défaut d'une requête de recherche"""
+        name = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+        return cls(os.path.join(checkpoint_dir, f"{name}.json.gz"))
+
+    def save(self, query, seen_state, frontier_state, matches=()):
+        """
+        Écrit l'état du crawl.
+
+        Args:
+            query (str): Requête du crawl
+            seen_state (list|dict): Identifiants déjà vus, explorés ou en file (idset.id_set_state)
+            frontier_state (dict): État sérialisé de la frontière (Frontier.to_state)
+            matches (iterable): Vidéos correspondantes trouvées mais pas encore retournées
+        """
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "query": query,
+            "saved_at": time.time(),
+            "seen": seen_state,
+            "frontier": frontier_state,
+            "matches": list(matches),
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(state, f, separators=(",", ":"), default=video_to_json)
+        os.replace(tmp_path, self.path)
+        self.saves += 1
+
+    def load(self, query=None):
+        """
+        Lit le dernier état sauvegardé.
+
+        Args:
+            query (str): Si fourni, ignore un point de reprise d'une autre requête
+
+        Returns:
+            dict|None: L'état, ou None si absent, illisible ou d'une autre requête
+        """
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != CHECKPOINT_VERSION:
+            return None
+        if query is not None and state.get("query") != query:
+            return None
+        return state
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
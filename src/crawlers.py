@@ -5,44 +5,212 @@ import re
 from abc import abstractmethod
 from datetime import datetime, timedelta
 import os
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.transport import HttpTransport
+from src.extractor import extract_initial_data
+from src.frontier import make_frontier
+from src.checkpoint import CrawlCheckpoint
+from src.idset import make_id_set, id_set_state, load_id_set_state, id_set_memory
+from src.filters import compile_filters
+from src.ratelimit import AdaptiveRateLimiter
+from src.parsing import ParsePool, ParseStats
+from src.video import VideoRecord
+from src.enrichment import MetadataEnricher
+from src.registry import UploadRegistry
+
+
+class _QueryRun:
+    """État d'une requête dans multi_stream_crawl (frontière et rendement)"""
+
+    def __init__(self, query, frontier):
+        self.query = query
+        self.frontier = frontier
+        self.pending = deque()  # Vidéos trouvées pas encore retournées
+        self.requests = 0
+        self.matches = 0
+        self.active = True
+
+    def add_matches(self, videos):
+        self.pending.extend(videos)
+        self.matches += len(videos)
+
+    def yield_rate(self):
+        return self.matches / self.requests if self.requests else 0.0
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "matches": self.matches,
+            "yield": self.yield_rate(),
+            "active": self.active,
+            "frontier": self.frontier.stats(),
+        }
+
+
+class _ExpansionStats:
+    """Rendement d'une stratégie d'expansion (vidéos connexes, chaînes)"""
+
+    def __init__(self):
+        self.pages = 0
+        self.candidates = 0
+        self.matches = 0
+
+    def add(self, candidates, matches):
+        self.pages += 1
+        self.candidates += candidates
+        self.matches += matches
+
+    def stats(self):
+        return {
+            "pages": self.pages,
+            "candidates": self.candidates,
+            "matches": self.matches,
+            "candidates_per_page": self.candidates / self.pages if self.pages else 0.0,
+            "matches_per_page": self.matches / self.pages if self.pages else 0.0,
+        }
+
+
+# Date relative ("3 days ago", "Streamed 2 weeks ago", "Premiered 1 month ago") : nombre et unité
+_RELATIVE_DATE = re.compile(r"(\d+)\s*(minute|hour|day|week|month|year)s?\b")
+_RELATIVE_DATE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+def _iterate_async(async_gen):
+    """Consomme un générateur asynchrone depuis du code synchrone"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(async_gen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(async_gen.aclose())
+        loop.close()
 
 class Crawler:
-    def __init__(self, key):
+    # Durée de validité en cache (secondes) par type de page
+    CACHE_TTLS = {
+        "search": 15 * 60,
+        "watch": 24 * 3600,
+        "channel": 3600,
+    }
+
+    # Nombre de nouvelles tentatives pour une page perdue (limitation, erreur réseau)
+    MAX_PAGE_RETRIES = 2
+
+    # Stratégies d'expansion : vidéos connexes (pages vidéo) et vidéos des chaînes ayant donné un résultat
+    EXPANSIONS = ("related", "channel")
 
+    # Fonction d'extraction sans état, de niveau module, exécutée par les processus du pool
+    # d'analyse (aucun crawler n'y est instancié) ; None : analyse dans le processus courant
+    page_extractor = None
+
+    def __init__(self, key, pool_size=10, timeout=(5, 20), cache=None, seen_set="set", seen_error_rate=0.001,
+                 rate_limiter=None, parse_workers=0, registry=None):
+
+        # Structure des ensembles d'identifiants : "set", "compact" (exact) ou "bloom" (probabiliste)
+        self.seen_set = seen_set
+        self.seen_error_rate = seen_error_rate
         self.routes = self.get_routes(key)
+        # Registre des vidéos déjà uploadées (UploadRegistry), relu de façon incrémentale : celui
+        # par défaut (même base que run.py) si aucun n'est fourni, aucun si registry=False
+        # (benchmark : aucune base créée, aucune vidéo exclue)
+        self._owns_registry = registry is None
+        if registry is None:
+            registry = UploadRegistry()
+        self.registry = registry if registry is not False else None
+        self._registry_seq = 0
         self.uploaded_videos = self.load_uploaded_videos()
+        # Session HTTP partagée par crawl() et stream_crawl() (connexions réutilisées)
+        # Limiteur de débit adaptatif par hôte (False pour le désactiver)
+        if rate_limiter is None:
+            rate_limiter = AdaptiveRateLimiter()
+        self.transport = HttpTransport(headers=self.headers(), pool_size=pool_size, timeout=timeout,
+                                       rate_limiter=rate_limiter or None)
+        # Cache disque optionnel des pages (PageCache)
+        self.cache = cache
+        # Analyse des pages dans un pool de processus (0 : dans le processus courant)
+        self.parse_stats = ParseStats()
+        self.parse_pool = None
+        if parse_workers and self.page_extractor:
+            self.parse_pool = ParsePool(self.page_extractor, workers=parse_workers, stats=self.parse_stats)
+        # Complément des durées et dates manquantes avant filtrage (MetadataEnricher, optionnel)
+        self.enricher = None
+        # Dossier des points de reprise de stream_crawl(..., resume=True)
+        self.checkpoint_dir = "src/media/checkpoints"
+        # Frontière du dernier crawl lancé (statistiques de taille et de profondeur)
+        self.frontier = None
+        self.seen_videosID = None
+        self._compiled_filters = None
+        self._lost_pages = {}
+        self.query_runs = {}
+        # Stratégies d'expansion du crawl en cours et chaînes à moissonner
+        self.expansions = ("related",)
+        self.channel_pages = 5
+        self.expansion_stats = {}
+        self._channel_queue = deque()
+        self._harvested_channels = set()
+        self._crawl_matches = 0
+        self._crawl_requests_start = 0
 
     def get_routes(self, key):
         with open("src/routes.json", "r") as f:
             return json.load(f)[key]
     
     def reload_uploaded_videos(self):
-        """Recharge la liste des vidéos déjà téléchargées"""
-        self.uploaded_videos = self.load_uploaded_videos()
+        """Ajoute les vidéos uploadées depuis le dernier chargement (seules les nouvelles entrées du registre sont lues)"""
+        self._read_registry(self.uploaded_videos)
         return len(self.uploaded_videos)
     
     def load_uploaded_videos(self):
         """Charge la liste des vidéos déjà téléchargées"""
-        try:
-            with open("src/media/uploaded_videos.json", "r") as f:
-                data = json.load(f)
-                # Création d'un ensemble contenant à la fois les IDs originaux et les IDs uploadés
-                uploaded_ids = set()
-                for video in data.get("videos", []):
-                    if video.get("videoId"):
-                        uploaded_ids.add(video.get("videoId"))
-                    if video.get("uploadedId"):
-                        uploaded_ids.add(video.get("uploadedId"))
-                return uploaded_ids
-        except (FileNotFoundError, json.JSONDecodeError):
-            return set()
+        # Ensemble contenant à la fois les IDs originaux et les IDs uploadés
+        uploaded_ids = self._new_id_set(exact=True)
+        self._registry_seq = 0
+        self._read_registry(uploaded_ids)
+        return uploaded_ids
+
+    def _read_registry(self, uploaded_ids):
+        """Ajoute à l'ensemble les entrées du registre postérieures à la dernière lecture"""
+        if self.registry is None:
+            return
+        for seq, video_id, uploaded_id in self.registry.entries_since(self._registry_seq):
+            if video_id:
+                uploaded_ids.add(video_id)
+            if uploaded_id:
+                uploaded_ids.add(uploaded_id)
+            self._registry_seq = seq
+
+    def _new_id_set(self, exact=False):
+        """
+        Crée un ensemble d'identifiants vidéo du type configuré.
+
+        Args:
+            exact (bool): Remplacer le filtre de Bloom par l'ensemble compact exact
+                (pour les vidéos uploadées, où un faux positif ferait sauter une vidéo)
+        """
+        kind = self.seen_set
+        if exact and kind == "bloom":
+            kind = "compact"
+        return make_id_set(kind, error_rate=self.seen_error_rate)
 
     def headers(self):
         return {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "*/*",
             "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate",
             "DNT": "1",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
@@ -53,11 +221,76 @@ class Crawler:
             "Cache-Control": "max-age=0"
         }
     
+    def fetch_page(self, url, route="watch"):
+        """
+        Retourne le HTML brut d'une page, depuis le cache disque si possible.
+
+        Args:
+            url (str): URL de la page
+            route (str): Type de page ("search", "watch"...), détermine le TTL du cache
+
+        Returns:
+            str|None: Le corps de la page, None en cas d'erreur réseau
+        """
+        if self.cache:
+            body = self.cache.get(url, self.CACHE_TTLS.get(route, 0))
+            if body is not None:
+                return body.decode("utf-8", errors="replace")
+
+        try:
+            response = self.transport.get(url)
+        except requests.RequestException:
+            return None
+
+        if self.cache and response.status_code == 200:
+            self.cache.put(url, response.content)
+        return response.text
+
+    def get_video_page(self, video_url):
+        """Télécharge une page vidéo et retourne son HTML brut (analysé par extract_videos)"""
+        return self.fetch_page(video_url, "watch")
+
     def get_video_soup(self, video_url):
-        return bs4.BeautifulSoup(requests.get(video_url, headers=self.headers()).text, "html.parser")
+        """Alias conservé pour compatibilité : retourne le HTML brut, sans construire de DOM"""
+        return self.get_video_page(video_url)
+
+    def parse_page(self, page):
+        """
+        Extrait les vidéos d'une page brute, dans le pool de processus s'il est
+        configuré, et mesure le temps d'analyse.
+
+        Returns:
+            list|None: Vidéos extraites, None si l'analyse a échoué ou dépassé le délai
+        """
+        if self.parse_pool:
+            return self.parse_pool.parse(page)
+        started = time.perf_counter()
+        videos = self.extract_videos(page)
+        self.parse_stats.record((time.perf_counter() - started) * 1000)
+        return videos
+
+    def _fetch_and_parse(self, video_url):
+        """Télécharge et analyse une page vidéo (None si perdue)"""
+        video_page = self.get_video_page(video_url)
+        return self.parse_page(video_page) if video_page else None
+
+    def close(self):
+        """Ferme la session HTTP, arrête le pool d'analyse et ferme le registre par défaut"""
+        if self.parse_pool:
+            self.parse_pool.close()
+        self.transport.close()
+        if self._owns_registry:
+            self.registry.close()
+
+    def transport_stats(self):
+        """Retourne les compteurs de la session HTTP (requêtes, connexions réutilisées, débit...)"""
+        stats = self.transport.stats.snapshot()
+        if self.transport.rate_limiter:
+            stats["rate_limiter"] = self.transport.rate_limiter.stats()
+        return stats
     
     def _matches_filters(self, video, filters):
-        """Vérifie si une vidéo correspond aux filtres spécifiés"""
+        """Vérifie si une vidéo correspond aux filtres spécifiés (dict ou CompiledFilters)"""
         # Vérifier si la vidéo est déjà téléchargée
         if video.get('videoId') in self.uploaded_videos:
             return False
@@ -65,101 +298,246 @@ class Crawler:
         if not filters:
             return True
         
-        # Filtre par durée
-        if 'duration' in filters and video.get('duration') is not None:
-            duration = video['duration']
-            if 'min' in filters['duration'] and duration < filters['duration']['min']:
-                return False
-            if 'max' in filters['duration'] and duration > filters['duration']['max']:
-                return False
-        
-        # Filtre par nombre de vues
-        if 'views' in filters and video.get('views') is not None:
-            views = video['views']
-            if 'min' in filters['views'] and views < filters['views']['min']:
-                return False
-            if 'max' in filters['views'] and views > filters['views']['max']:
-                return False
-        
-        # Filtre par date de publication
-        if 'publishedTime' in filters and video.get('publishedTime'):
-            try:
-                # Convertir la date de la vidéo en datetime pour la comparaison
-                video_date = video['publishedTime']
-                if isinstance(video_date, str) and 'T' in video_date:
-                    video_datetime = datetime.fromisoformat(video_date.replace('Z', '+00:00'))
-                    
-                    if 'min' in filters['publishedTime']:
-                        min_date = datetime.fromisoformat(filters['publishedTime']['min'].replace('Z', '+00:00'))
-                        if video_datetime < min_date:
-                            return False
-                    
-                    if 'max' in filters['publishedTime']:
-                        max_date = datetime.fromisoformat(filters['publishedTime']['max'].replace('Z', '+00:00'))
-                        if video_datetime > max_date:
-                            return False
-            except:
-                # Si on ne peut pas parser la date, on ignore ce filtre
-                pass
-        
-        return True
+        # Ne recompiler que si le dict de filtres change
+        if self._compiled_filters is None or self._compiled_filters.filters is not filters:
+            self._compiled_filters = compile_filters(filters)
+        return self._compiled_filters(video)
     
-    def crawl(self, query, size, filters=None):
-        crawled_videos = []
+    def _start_crawl(self, frontier, filters, expansions=("related",), channel_pages=5):
+        """
+        Compile les filtres, prépare la frontière et l'ensemble des vidéos vues,
+        et remet à zéro les métriques.
+
+        Args:
+            expansions (tuple): Stratégies d'expansion parmi EXPANSIONS
+            channel_pages (int): Budget de requêtes par chaîne moissonnée
+
+        Returns:
+            tuple: (frontière, ensemble des identifiants vus, filtres compilés)
+        """
+        unknown = set(expansions) - set(self.EXPANSIONS)
+        if unknown:
+            raise ValueError(f"Stratégie d'expansion inconnue: {', '.join(sorted(unknown))}")
+        self.expansions = tuple(expansions)
+        self.channel_pages = channel_pages
+        self.expansion_stats = {name: _ExpansionStats() for name in self.expansions}
+        self._channel_queue = deque()
+        self._harvested_channels = set()
+        self._compiled_filters = compile_filters(filters)
+        self.frontier = make_frontier(frontier, self._compiled_filters)
+        # Une frontière partagée (SharedFrontier) apporte l'ensemble des vues global de son job
+        self.seen_videosID = self.frontier.seen_set() if hasattr(self.frontier, "seen_set") else self._new_id_set()
+        self._lost_pages = {}
+        self._crawl_matches = 0
+        self._crawl_requests_start = self.transport.stats.requests
+        # Même objet que celui du pool d'analyse : remis à zéro sur place
+        self.parse_stats.reset()
+        return self.frontier, self.seen_videosID, self._compiled_filters
+
+    def _requeue_lost_page(self, frontier, entry):
+        """Remet en file une vidéo dont la page n'a pas pu être récupérée, un nombre limité de fois"""
+        video, depth, matched = entry
+        attempts = self._lost_pages.get(video["videoId"], 0)
+        if attempts < self.MAX_PAGE_RETRIES:
+            self._lost_pages[video["videoId"]] = attempts + 1
+            frontier.restore(video, depth, matched=matched)
+        else:
+            frontier.done(video)
+
+    def memory_usage(self):
+        """Mémoire approximative (octets) des ensembles d'identifiants du crawl en cours"""
+        return {
+            "seen": id_set_memory(self.seen_videosID) if self.seen_videosID is not None else 0,
+            "uploaded": id_set_memory(self.uploaded_videos),
+        }
+
+    def crawl_stats(self):
+        """
+        Métriques du dernier crawl, pour comparer les stratégies de frontière.
+
+        Returns:
+            dict: Requêtes HTTP, correspondances, correspondances par requête et état de la frontière
+        """
+        requests_count = self.transport.stats.requests - self._crawl_requests_start
+        return {
+            "requests": requests_count,
+            "matches": self._crawl_matches,
+            "matches_per_request": self._crawl_matches / requests_count if requests_count else 0.0,
+            "frontier": self.frontier.stats() if self.frontier is not None else {},
+            "seen": len(self.seen_videosID) if self.seen_videosID is not None else 0,
+            "memory": self.memory_usage(),
+            "parse": self.parse_stats.snapshot(),
+            "strategies": {name: stats.stats() for name, stats in self.expansion_stats.items()},
+            "enrichment": self.enricher.stats() if self.enricher else {},
+        }
+
+    def _enqueue_new_videos(self, videos, seen_videosID, frontier, filters, parent=None, record=True, enrich=True):
+        """
+        Ajoute à la frontière les vidéos jamais vues ni déjà uploadées.
+
+        Args:
+            filters (CompiledFilters): Filtres compilés du crawl
+            parent (tuple): Entrée (vidéo, profondeur, correspond) explorée, None pour la recherche
+            record (bool): Compter cette page comme une expansion du parent (False pour les
+                pages d'une chaîne, comptée une seule fois pour toute la moisson)
+            enrich (bool): Compléter les métadonnées ici (False si _aenrich l'a déjà fait)
+
+        Returns:
+            list: Les nouvelles vidéos qui correspondent aux filtres
+        """
+        depth = parent[1] + 1 if parent else 0
+        parent_matched = bool(parent and parent[2])
+        new_videos = []
+        if hasattr(seen_videosID, "add_new"):
+            # Ensemble partagé entre processus : test et ajout atomiques en un aller-retour
+            candidates = [video for video in videos if video["videoId"] not in self.uploaded_videos]
+            new_ids = seen_videosID.add_new([video["videoId"] for video in candidates])
+            for video in candidates:
+                if video["videoId"] in new_ids:
+                    new_ids.discard(video["videoId"])
+                    new_videos.append(video)
+        else:
+            for video in videos:
+                if video["videoId"] not in seen_videosID and video["videoId"] not in self.uploaded_videos:
+                    seen_videosID.add(video["videoId"])
+                    new_videos.append(video)
+
+        # Durées manquantes et dates ambiguës résolues par lot avant le filtrage
+        if enrich and self.enricher and new_videos:
+            self.enricher.enrich(new_videos, filters)
+
+        # Filtres évalués en une passe sur toute la page
+        matched = []
+        for video, is_match in zip(new_videos, filters.batch(new_videos)):
+            frontier.push(video, depth, parent_matched=parent_matched, matched=is_match)
+            if is_match:
+                matched.append(video)
+        if parent and record:
+            frontier.record_expansion(parent[0], len(matched))
+        if "channel" in self.expansions:
+            self._schedule_channels(matched, depth)
+        self._crawl_matches += len(matched)
+        return matched
+
+    def _schedule_channels(self, videos, depth):
+        """Met en file, une seule fois par crawl, la chaîne de chaque vidéo correspondante"""
+        for video in videos:
+            channel_id = video.get("channelId")
+            if channel_id and channel_id not in self._harvested_channels:
+                self._harvested_channels.add(channel_id)
+                self._channel_queue.append((channel_id, (video, depth, True)))
+
+    def _expand(self, strategy, videos, seen_videosID, frontier, filters, entry, record=True, enrich=True):
+        """Ajoute les vidéos d'une page d'expansion et met à jour le rendement de la stratégie"""
+        if videos is None:
+            self.expansion_stats[strategy].add(0, 0)
+            return []
+        matched = self._enqueue_new_videos(videos, seen_videosID, frontier, filters, entry, record, enrich)
+        self.expansion_stats[strategy].add(len(videos), len(matched))
+        return matched
+
+    async def _aenrich(self, loop, videos, seen_videosID, filters):
+        """
+        Complète les métadonnées des vidéos pas encore vues d'une page dans un thread, sans
+        bloquer la boucle d'événements d'astream_crawl (requêtes player ou API Data).
+        """
+        if not self.enricher or not videos:
+            return
+        unseen = [video for video in videos
+                  if video["videoId"] not in seen_videosID and video["videoId"] not in self.uploaded_videos]
+        if unseen:
+            await loop.run_in_executor(None, self.enricher.enrich, unseen, filters)
+
+    def _has_expansions(self, frontier):
+        """Reste-t-il des chaînes à moissonner ou des vidéos à explorer (attend une frontière partagée)"""
+        return bool(self._channel_queue) or ("related" in self.expansions and frontier.wait())
+
+    async def _ahas_expansions(self, loop, frontier):
+        """_has_expansions pour astream_crawl : l'attente d'une frontière partagée passe par un thread"""
+        if self._channel_queue:
+            return True
+        if "related" not in self.expansions:
+            return False
+        return bool(frontier) or await loop.run_in_executor(None, frontier.wait)
+
+    def _harvest_next_channel(self, seen_videosID, frontier, filters):
+        """
+        Moissonne la prochaine chaîne en file.
+
+        Yields:
+            list: Nouvelles vidéos correspondantes de chaque page de la chaîne
+        """
+        channel_id, entry = self._channel_queue.popleft()
+        total = 0
+        try:
+            for videos in self._harvest_channel_pages(channel_id):
+                matched = self._expand("channel", videos, seen_videosID, frontier, filters, entry, record=False)
+                total += len(matched)
+                yield matched
+        finally:
+            # Une moisson de chaîne compte pour une seule expansion de la vidéo qui l'a révélée
+            frontier.record_expansion(entry[0], total)
+
+    def crawl(self, query, size, filters=None, frontier=None, search_pages=1, expansions=("related",),
+              channel_pages=5):
         matched_videos = []
-        seen_videosID = set()  # Pour éviter les doublons
+        # Vidéos découvertes restant à explorer, et identifiants déjà vus (pour éviter les doublons)
+        frontier, seen_videosID, filters = self._start_crawl(frontier, filters, expansions, channel_pages)
 
         # Recherche initiale
-        init_search = self.search(query)
-        init_videos = self.extract_videos(init_search)
-
-        # Ajout des vidéos initiales
-        for video in init_videos:
-            if video["videoId"] not in seen_videosID and video["videoId"] not in self.uploaded_videos:
-                crawled_videos.append(video)
-                seen_videosID.add(video["videoId"])
-                if self._matches_filters(video, filters):
-                    matched_videos.append(video)
-
-        # Boucle principale de recherche
-        iteration = 0
-        explored_videos = set()  # Pour tracker les vidéos déjà explorées
-        
-        while len(matched_videos) < size:
-            iteration += 1
-            
-            # Vérifier s'il y a encore des vidéos non explorées
-            videos_to_explore = [v for v in crawled_videos if v['videoId'] not in explored_videos]
-            
-            if not videos_to_explore:
-                break
-                
-            current_batch = videos_to_explore  # Explorer seulement les vidéos non explorées
-            
-            for video in current_batch:
-                if len(matched_videos) >= size:
-                    break
-                
-                explored_videos.add(video['videoId'])  # Marquer comme explorée
-                video_url = video["url"]
-                video_soup = self.get_video_soup(video_url)
-
-                if video_soup:
-                    related_videos = self.extract_videos(video_soup)
-                    # Ajout des nouvelles vidéos uniques
-                    for new_video in related_videos:
-                        if new_video["videoId"] not in seen_videosID and new_video["videoId"] not in self.uploaded_videos:
-                            crawled_videos.append(new_video)
-                            seen_videosID.add(new_video["videoId"])
-                            if self._matches_filters(new_video, filters):
-                                matched_videos.append(new_video)
-                            
-                            if len(matched_videos) >= size:
-                                break
+        for init_videos in self.search_pages(query, search_pages):
+            matched_videos.extend(self._enqueue_new_videos(init_videos, seen_videosID, frontier, filters))
+
+        # Boucle principale de recherche : chaque vidéo est explorée une seule fois
+        while len(matched_videos) < size and self._has_expansions(frontier):
+            if self._channel_queue:
+                for new_matches in self._harvest_next_channel(seen_videosID, frontier, filters):
+                    matched_videos.extend(new_matches)
+                continue
+
+            entry = frontier.pop()
+            related_videos = self._fetch_and_parse(entry[0]["url"])
+            matched_videos.extend(self._expand("related", related_videos, seen_videosID, frontier, filters, entry))
+            if related_videos is None:
+                self._requeue_lost_page(frontier, entry)
 
+        frontier.close()
         return matched_videos[:size]  # Retourne exactement le nombre demandé de vidéos
 
-    def stream_crawl(self, query, filters=None):
+    def _restore_checkpoint(self, checkpoint, query, seen_videosID, frontier, filters):
+        """
+        Recharge un point de reprise dans l'ensemble des vues et la frontière.
+
+        Le point de reprise ne garde pas les filtres : les vidéos correspondantes
+        et l'indicateur `matched` des entrées de la frontière sont réévalués avec
+        les filtres du crawl repris (modifiés, ou fenêtre de date relative déplacée).
+
+        Returns:
+            list|None: Vidéos correspondantes pas encore retournées, None si aucun point de reprise
+        """
+        state = checkpoint.load(query)
+        if not state:
+            return None
+        load_id_set_state(seen_videosID, state["seen"])
+        frontier_state = state["frontier"]
+        entries = frontier_state.get("entries", [])
+        for entry in entries:
+            entry[0] = VideoRecord.from_dict(entry[0])
+        for entry, is_match in zip(entries, filters.batch([entry[0] for entry in entries])):
+            entry[2] = is_match
+        frontier.load_state(frontier_state)
+        matches = [VideoRecord.from_dict(video) for video in state.get("matches", [])
+                   if video["videoId"] not in self.uploaded_videos]
+        return [video for video, is_match in zip(matches, filters.batch(matches)) if is_match]
+
+    def _save_checkpoint(self, checkpoint, query, seen_videosID, frontier, pending=(), matches=()):
+        try:
+            checkpoint.save(query, id_set_state(seen_videosID), frontier.to_state(pending), matches)
+        except OSError:
+            pass
+
+    def stream_crawl(self, query, filters=None, concurrency=1, frontier=None, search_pages=1,
+                     resume=False, checkpoint_every=50, expansions=("related",), channel_pages=5):
         """
         Générateur qui retourne les vidéos une par une au fur et à mesure du crawl
         Sans limite de taille - continue indéfiniment jusqu'à épuisement
@@ -167,148 +545,714 @@ class Crawler:
         Args:
             query (str): Terme de recherche initial
             filters (dict): Filtres optionnels à appliquer
+            concurrency (int): Nombre de pages vidéo téléchargées en parallèle
+                (au-delà de 1, délègue à astream_crawl)
+            frontier (str|Frontier): Ordre d'exploration, "fifo" (défaut) ou "best_first", ou
+                une SharedFrontier pour crawler la requête à plusieurs processus
+            search_pages (int): Nombre maximal de pages de résultats de recherche
+            resume (bool): Reprendre depuis le dernier point de reprise de la requête
+                et en sauvegarder un régulièrement (dans checkpoint_dir)
+            checkpoint_every (int): Nombre de pages explorées entre deux sauvegardes
+            expansions (tuple): Stratégies d'expansion : "related" (vidéos connexes des
+                pages vidéo) et/ou "channel" (onglets vidéos/shorts et playlists des
+                chaînes ayant donné une vidéo correspondante, moissonnées en priorité)
+            channel_pages (int): Budget de requêtes par chaîne moissonnée
             
         Yields:
-            dict: Vidéo qui correspond aux filtres (une à la fois)
+            VideoRecord: Vidéo qui correspond aux filtres (une à la fois)
         """
-        seen_videosID = set()  # Pour éviter les doublons
-        videos_to_explore = []  # Liste des vidéos à explorer
-        explored_videos = set()  # Vidéos déjà explorées
-        
-        # Recherche initiale
-        init_search = self.search(query)
-        if init_search:
-            init_videos = self.extract_videos(init_search)
-            
-            # Ajouter les vidéos initiales
-            for video in init_videos:
-                if video["videoId"] not in seen_videosID and video["videoId"] not in self.uploaded_videos:
-                    seen_videosID.add(video["videoId"])
-                    videos_to_explore.append(video)
-                    
-                    # Yield si elle correspond aux filtres
-                    if self._matches_filters(video, filters):
-                        yield video
-        
-        # Exploration continue
-        while videos_to_explore:
-            # Prendre la prochaine vidéo non explorée
-            current_video = None
-            for video in videos_to_explore:
-                if video['videoId'] not in explored_videos:
-                    current_video = video
-                    break
-            
-            if not current_video:
-                # Toutes les vidéos ont été explorées
-                break
-            
-            explored_videos.add(current_video['videoId'])
-            video_url = current_video["url"]
+        if concurrency > 1:
+            yield from _iterate_async(self.astream_crawl(query, filters, concurrency=concurrency, frontier=frontier,
+                                                             search_pages=search_pages, resume=resume,
+                                                             checkpoint_every=checkpoint_every,
+                                                             expansions=expansions, channel_pages=channel_pages))
+            return
+
+        # Vidéos à explorer, et identifiants déjà vus (pour éviter les doublons)
+        frontier, seen_videosID, filters = self._start_crawl(frontier, filters, expansions, channel_pages)
+        matches = deque()  # Vidéos trouvées pas encore retournées
+        checkpoint = CrawlCheckpoint.for_query(query, self.checkpoint_dir) if resume else None
+        explored = 0
+        finished = False
+
+        try:
+            restored = (self._restore_checkpoint(checkpoint, query, seen_videosID, frontier, filters)
+                        if checkpoint else None)
+            if restored is not None:
+                matches.extend(restored)
+            else:
+                # Recherche initiale
+                for init_videos in self.search_pages(query, search_pages):
+                    matches.extend(self._enqueue_new_videos(init_videos, seen_videosID, frontier, filters))
+                    while matches:
+                        yield matches.popleft()
+            while matches:
+                yield matches.popleft()
             
-            # Obtenir les vidéos connexes
-            video_soup = self.get_video_soup(video_url)
-            if video_soup:
-                related_videos = self.extract_videos(video_soup)
+            # Exploration continue
+            while self._has_expansions(frontier):
+                # Les chaînes qui ont déjà donné un résultat passent en premier
+                if self._channel_queue:
+                    for new_matches in self._harvest_next_channel(seen_videosID, frontier, filters):
+                        matches.extend(new_matches)
+                        while matches:
+                            yield matches.popleft()
+                    continue
+
+                entry = frontier.pop()
                 
-                for new_video in related_videos:
-                    if new_video["videoId"] not in seen_videosID and new_video["videoId"] not in self.uploaded_videos:
-                        seen_videosID.add(new_video["videoId"])
-                        videos_to_explore.append(new_video)
-                        
-                        # Yield immédiatement si elle correspond aux filtres
-                        if self._matches_filters(new_video, filters):
-                            yield new_video
+                # Obtenir les vidéos connexes
+                related_videos = self._fetch_and_parse(entry[0]["url"])
+                matches.extend(self._expand("related", related_videos, seen_videosID, frontier, filters, entry))
+                if related_videos is None:
+                    self._requeue_lost_page(frontier, entry)
+
+                explored += 1
+                if checkpoint and explored % checkpoint_every == 0:
+                    self._save_checkpoint(checkpoint, query, seen_videosID, frontier, matches=matches)
+
+                # Yield immédiatement celles qui correspondent aux filtres
+                while matches:
+                    yield matches.popleft()
+            finished = True
+        finally:
+            if checkpoint and finished:
+                # Voisinage épuisé : la prochaine exécution repart d'une recherche
+                checkpoint.clear()
+            elif checkpoint:
+                self._save_checkpoint(checkpoint, query, seen_videosID, frontier, matches=matches)
+            frontier.close()
+
+    async def astream_crawl(self, query, filters=None, concurrency=8, frontier=None, search_pages=1,
+                            resume=False, checkpoint_every=50, expansions=("related",), channel_pages=5):
+        """
+        Variante asynchrone de stream_crawl qui garde `concurrency` pages vidéo
+        en cours de téléchargement depuis la file d'exploration.
+
+        Les requêtes passent par la session partagée (exécutées dans un pool de
+        threads) ; prévoir un pool_size du transport au moins égal à concurrency.
+        Avec parse_workers, les pages reçues sont analysées dans le pool de
+        processus pendant que les téléchargements suivants continuent.
+
+        Args:
+            query (str): Terme de recherche initial
+            filters (dict): Filtres optionnels à appliquer
+            concurrency (int): Nombre maximal de pages en vol
+            frontier (str|Frontier): Ordre d'exploration, "fifo" (défaut) ou "best_first"
+            search_pages (int): Nombre maximal de pages de résultats de recherche
+            resume (bool): Reprendre depuis le dernier point de reprise et en sauvegarder
+            checkpoint_every (int): Nombre de pages explorées entre deux sauvegardes
+            expansions (tuple): Stratégies d'expansion ("related", "channel")
+            channel_pages (int): Budget de requêtes par chaîne moissonnée
+
+        Yields:
+            VideoRecord: Vidéo qui correspond aux filtres, dès que sa page parente est analysée
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        # Vidéos à explorer, et identifiants déjà vus (pour éviter les doublons)
+        frontier, seen_videosID, filters = self._start_crawl(frontier, filters, expansions, channel_pages)
+        matches = deque()  # Vidéos trouvées pas encore retournées
+        in_flight = {}  # Tâche de téléchargement -> entrée de frontière explorée
+        parsing = {}  # Tâche d'analyse -> (entrée de frontière, future du pool de processus)
+        harvests = {}  # Tâche de moisson d'une chaîne -> entrée de la vidéo qui l'a révélée
+        checkpoint = CrawlCheckpoint.for_query(query, self.checkpoint_dir) if resume else None
+        explored = 0
+        finished = False
+
+        try:
+            restored = (self._restore_checkpoint(checkpoint, query, seen_videosID, frontier, filters)
+                        if checkpoint else None)
+            if restored is not None:
+                matches.extend(restored)
+            else:
+                # Recherche initiale
+                pages = self.search_pages(query, search_pages)
+                while True:
+                    init_videos = await loop.run_in_executor(executor, next, pages, None)
+                    if init_videos is None:
+                        break
+                    await self._aenrich(loop, init_videos, seen_videosID, filters)
+                    matches.extend(self._enqueue_new_videos(init_videos, seen_videosID, frontier, filters,
+                                                            enrich=False))
+                    while matches:
+                        yield matches.popleft()
+            while matches:
+                yield matches.popleft()
+
+            # Exploration continue avec N pages en vol
+            while in_flight or parsing or harvests or await self._ahas_expansions(loop, frontier):
+                while self._channel_queue and len(in_flight) + len(harvests) < concurrency:
+                    channel_id, entry = self._channel_queue.popleft()
+                    task = loop.run_in_executor(executor, self._harvest_channel_pages, channel_id)
+                    harvests[task] = entry
+                while ("related" in self.expansions and frontier
+                       and len(in_flight) + len(harvests) < concurrency):
+                    entry = frontier.pop()
+                    task = loop.run_in_executor(executor, self.get_video_page, entry[0]["url"])
+                    in_flight[task] = entry
+
+                done, _ = await asyncio.wait([*in_flight, *parsing, *harvests], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task in harvests:
+                        entry = harvests.pop(task)
+                        total = 0
+                        for videos in task.result():
+                            await self._aenrich(loop, videos, seen_videosID, filters)
+                            matched = self._expand("channel", videos, seen_videosID, frontier, filters, entry,
+                                                   record=False, enrich=False)
+                            total += len(matched)
+                            matches.extend(matched)
+                        frontier.record_expansion(entry[0], total)
+                        continue
+                    if task in parsing:
+                        entry, future = parsing.pop(task)
+                        if not task.cancelled() and isinstance(task.exception(), asyncio.TimeoutError):
+                            related_videos = self.parse_pool.timed_out(future)
+                        else:
+                            related_videos = self.parse_pool.result(future)
+                    else:
+                        entry = in_flight.pop(task)
+                        video_page = task.result()
+                        if video_page and self.parse_pool:
+                            # Analyse déportée : la place libérée sert au téléchargement suivant
+                            future = self.parse_pool.submit(video_page)
+                            waiter = asyncio.wait_for(asyncio.wrap_future(future), self.parse_pool.timeout)
+                            parsing[asyncio.ensure_future(waiter)] = (entry, future)
+                            continue
+                        related_videos = self.parse_page(video_page) if video_page else None
+
+                    await self._aenrich(loop, related_videos, seen_videosID, filters)
+                    matches.extend(self._expand("related", related_videos, seen_videosID, frontier, filters, entry,
+                                                enrich=False))
+                    if related_videos is None:
+                        self._requeue_lost_page(frontier, entry)
+                    explored += 1
+                    if checkpoint and explored % checkpoint_every == 0:
+                        self._save_checkpoint(checkpoint, query, seen_videosID, frontier,
+                                              pending=self._pending_entries(in_flight, parsing), matches=matches)
+
+                while matches:
+                    yield matches.popleft()
+            finished = True
+        finally:
+            # Les pages encore en vol ou en analyse seront réexplorées à la reprise
+            if checkpoint and finished:
+                checkpoint.clear()
+            elif checkpoint:
+                self._save_checkpoint(checkpoint, query, seen_videosID, frontier,
+                                      pending=self._pending_entries(in_flight, parsing), matches=matches)
+            for task in [*in_flight, *parsing, *harvests]:
+                task.cancel()
+            frontier.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _harvest_channel_pages(self, channel_id):
+        """
+        Toutes les pages d'une chaîne (exécuté dans le pool de threads d'astream_crawl).
+
+        Une erreur inattendue pendant la moisson arrête seulement cette chaîne :
+        les pages déjà obtenues sont gardées.
+        """
+        pages = []
+        try:
+            for videos in self.harvest_channel(channel_id, self.channel_pages):
+                pages.append(videos)
+        except Exception:
+            pass
+        return pages
+
+    @staticmethod
+    def _pending_entries(in_flight, parsing):
+        """Entrées de frontière téléchargées ou analysées mais pas encore traitées"""
+        return [*in_flight.values(), *(entry for entry, _ in parsing.values())]
+
+    def multi_stream_crawl(self, queries, filters=None, frontier=None, search_pages=1, concurrency=None,
+                           min_requests=30, min_yield=0.0):
+        """
+        Crawl simultané de plusieurs requêtes, avec ensembles de vidéos vues et
+        uploadées partagés, et vidéos trouvées entrelacées équitablement.
+
+        À chaque tour, une page est explorée pour chaque requête active (en
+        parallèle), puis les correspondances sont retournées à tour de rôle.
+        Une requête dont le rendement (vidéos trouvées par requête HTTP) reste
+        sous `min_yield` après `min_requests` requêtes est abandonnée.
+
+        Args:
+            queries (list): Termes de recherche initiaux
+            filters (dict): Filtres optionnels à appliquer
+            frontier (str): Ordre d'exploration de chaque requête, "fifo" ou "best_first"
+            search_pages (int): Nombre maximal de pages de résultats par requête
+            concurrency (int): Pages téléchargées en parallèle (défaut : une par requête)
+            min_requests (int): Requêtes HTTP avant d'évaluer le rendement d'une requête
+            min_yield (float): Rendement minimal pour garder une requête active
+
+        Yields:
+            VideoRecord: Vidéo qui correspond aux filtres (une à la fois)
+        """
+        _, seen_videosID, filters = self._start_crawl(None, filters)
+        self.frontier = None
+        runs = [_QueryRun(query, make_frontier(frontier, filters)) for query in queries]
+        self.query_runs = {run.query: run for run in runs}
+        executor = ThreadPoolExecutor(max_workers=concurrency or len(runs))
+
+        try:
+            # Recherches initiales en parallèle, ajoutées dans l'ordre des requêtes
+            search_results = executor.map(lambda run: list(self.search_pages(run.query, search_pages)), runs)
+            for run, pages in zip(runs, search_results):
+                run.requests += len(pages)
+                for init_videos in pages:
+                    run.add_matches(self._enqueue_new_videos(init_videos, seen_videosID, run.frontier, filters))
+            yield from self._interleave_matches(runs)
+
+            while True:
+                batch = [(run, run.frontier.pop()) for run in runs if run.active and run.frontier.wait()]
+                if not batch:
+                    break
+                results = executor.map(lambda item: self._fetch_and_parse(item[1][0]["url"]), batch)
+                for (run, entry), related_videos in zip(batch, results):
+                    run.requests += 1
+                    if related_videos is not None:
+                        run.add_matches(self._enqueue_new_videos(related_videos, seen_videosID, run.frontier,
+                                                                 filters, entry))
+                    else:
+                        self._requeue_lost_page(run.frontier, entry)
+
+                    # Abandonner les requêtes dont le voisinage ne donne plus rien
+                    if run.active and run.requests >= min_requests and run.yield_rate() < min_yield:
+                        run.active = False
+
+                yield from self._interleave_matches(runs)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _interleave_matches(runs):
+        """Retourne les vidéos trouvées à tour de rôle, une par requête"""
+        while any(run.pending for run in runs):
+            for run in runs:
+                if run.pending:
+                    yield run.pending.popleft()
+
+    def query_stats(self):
+        """Rendement par requête du dernier multi_stream_crawl"""
+        return {query: run.stats() for query, run in self.query_runs.items()}
 
     @abstractmethod
     def search(self, query):
         pass
 
+    def search_pages(self, query, max_pages=1):
+        """
+        Générateur des pages de résultats de recherche (une liste de vidéos par page).
+
+        Par défaut seule la première page est disponible ; les sous-classes
+        peuvent suivre la pagination du site.
+        """
+        yield self.extract_videos(self.search(query))
+
+    def harvest_channel(self, channel_id, max_pages=5):
+        """
+        Générateur des pages de vidéos d'une chaîne (une liste de vidéos par page).
+
+        Par défaut aucune page de chaîne n'est disponible ; les sous-classes
+        peuvent parcourir les onglets et playlists de la chaîne.
+        """
+        return iter(())
+
+
+def extract_youtube_videos(page):
+    """Vidéos d'une page YouTube brute (point d'entrée des processus du pool d'analyse)"""
+    return YoutubeCrawler.extract_videos(page)
+
+
 class YoutubeCrawler(Crawler):
-    def __init__(self):
-        super().__init__("youtube")
+    page_extractor = staticmethod(extract_youtube_videos)
+
+    def __init__(self, pool_size=10, timeout=(5, 20), cache=None, seen_set="set", seen_error_rate=0.001,
+                 rate_limiter=None, parse_workers=0, enrich_metadata=False, metadata_api_key=None,
+                 metadata_cache=None, registry=None):
+        """
+        Args:
+            enrich_metadata (bool): Compléter durées manquantes et dates ambiguës avant filtrage ; sans
+                complément, une vidéo sans durée (short sans lengthText) n'est pas filtrée sur la durée
+                et passe donc un filtre `duration.min`
+            metadata_api_key (str): Clé de l'API Data YouTube (lots de 50 vidéos) ; sans clé,
+                une requête player par vidéo
+            metadata_cache (MetadataCache): Cache persistant des métadonnées complétées
+            registry (UploadRegistry|bool): Registre des vidéos déjà uploadées (None : registre par
+                défaut, src/media/registry.db ; False : aucune vidéo exclue)
+        """
+        super().__init__("youtube", pool_size=pool_size, timeout=timeout, cache=cache,
+                         seen_set=seen_set, seen_error_rate=seen_error_rate, rate_limiter=rate_limiter,
+                         parse_workers=parse_workers, registry=registry)
 
         self.base_search_url = self.routes["base_search_url"]
         self.base_video_url = self.routes["base_video_url"]
         self.base_channel_url = self.routes["base_channel_url"]
         self.base_playlist_url = self.routes["base_playlist_url"]
         self.base_short_url = self.routes["base_short_url"]
+        self.innertube_search_url = self.routes["innertube_search_url"]
+        self.innertube_browse_url = self.routes["innertube_browse_url"]
+        VideoRecord.set_routes(self.routes)
+        if enrich_metadata:
+            self.enricher = MetadataEnricher(self.transport, self.routes, metadata_api_key, metadata_cache)
 
     def search(self, query):
         try:
 
             url = self.base_search_url + query
 
-            response = requests.get(url, headers=self.headers())
-            return bs4.BeautifulSoup(response.text, "html.parser")
+            return self.fetch_page(url, "search")
         except Exception:
             return None
 
-    def extract_videos(self, soup):
+    def search_pages(self, query, max_pages=1):
+        """
+        Parcourt les pages de résultats de recherche en suivant les jetons de
+        continuation (continuationItemRenderer) via l'endpoint JSON innertube.
+
+        Les réponses de continuation sont du JSON bien plus léger qu'une page HTML.
+
+        Args:
+            query (str): Terme de recherche
+            max_pages (int): Budget de pages (première page HTML comprise)
+
+        Yields:
+            list: Vidéos (videoRenderer) de chaque page
+        """
+        page = self.search(query)
+        data = self._load_initial_data(page)
+        if not data:
+            yield []
+            return
+
+        contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
+        videos, token = self._extract_search_items(contents)
+        yield videos
+
+        innertube = self._innertube_config(page)
+        for _ in range(max_pages - 1):
+            if not token:
+                break
+            data = self._fetch_continuation(self.innertube_search_url, token, innertube)
+            if not data:
+                break
+            items = []
+            for command in data.get('onResponseReceivedCommands', []):
+                if isinstance(command, dict):
+                    items.extend(command.get('appendContinuationItemsAction', {}).get('continuationItems', []))
+            videos, token = self._extract_search_items(items)
+            yield videos
+
+    def _innertube_config(self, page):
+        """Récupère la clé d'API et la version du client innertube depuis ytcfg"""
+        if isinstance(page, (bytes, bytearray)):
+            page = page.decode('utf-8', errors='replace')
+        page = page or ''
+        api_key = re.search(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"', page)
+        client_version = re.search(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"', page)
+        return {
+            "api_key": api_key.group(1) if api_key else None,
+            "client_version": client_version.group(1) if client_version else "2.20240101.00.00",
+        }
+
+    def _fetch_continuation(self, endpoint_url, token, innertube):
+        """Appelle un endpoint de continuation innertube (search, browse) et retourne le JSON"""
+        params = {"prettyPrint": "false"}
+        if innertube["api_key"]:
+            params["key"] = innertube["api_key"]
+        payload = {
+            "context": {
+                "client": {
+                    "clientName": "WEB",
+                    "clientVersion": innertube["client_version"],
+                    "hl": "en",
+                    "gl": "US",
+                }
+            },
+            "continuation": token,
+        }
         try:
-            script = soup.find('script', string=re.compile('var ytInitialData'))
-            if not script:
+            response = self.transport.post(endpoint_url, params=params, json=payload)
+            return response.json()
+        except (requests.RequestException, ValueError):
+            return None
+
+    @classmethod
+    def _extract_search_items(cls, items):
+        """
+        Extrait les vidéos d'une liste de sections de résultats de recherche.
+
+        Returns:
+            tuple: (vidéos, jeton de continuation ou None)
+        """
+        videos = []
+        token = None
+        for section in items:
+            if not isinstance(section, dict):
+                continue
+            for item in section.get('itemSectionRenderer', {}).get('contents', []):
+                try:
+                    v = item.get('videoRenderer') or item.get('compactVideoRenderer')
+                    if v:
+                        videos.append(cls._extract_video_info(v))
+                except Exception:
+                    # Renderer inattendu : seule cette vidéo est ignorée, pas la page ni le crawl
+                    continue
+            continuation = section.get('continuationItemRenderer')
+            if continuation:
+                token = continuation.get('continuationEndpoint', {}).get('continuationCommand', {}).get('token')
+        return videos, token
+
+    # Onglets moissonnés sur une chaîne, et nombre maximal de ses playlists parcourues
+    CHANNEL_TABS = ("videos", "shorts", "playlists")
+    MAX_CHANNEL_PLAYLISTS = 3
+
+    # Renderers recherchés dans les pages de chaîne, de playlist et leurs continuations
+    BROWSE_RENDERERS = ("videoRenderer", "reelItemRenderer", "shortsLockupViewModel", "playlistVideoRenderer",
+                        "gridPlaylistRenderer", "lockupViewModel", "continuationItemRenderer")
+
+    def harvest_channel(self, channel_id, max_pages=5):
+        """
+        Parcourt les onglets vidéos et shorts d'une chaîne puis ses premières
+        playlists, en suivant les continuations browse d'innertube.
+
+        Une page de chaîne liste une trentaine de vidéos (une centaine pour une
+        playlist), contre une vingtaine de vidéos connexes par page vidéo.
+
+        Args:
+            channel_id (str): Identifiant de la chaîne (browseId, "UC...")
+            max_pages (int): Budget de requêtes pour la chaîne (continuations comprises)
+
+        Yields:
+            list: Vidéos de chaque page
+        """
+        budget = [max_pages]
+        playlist_ids = []
+        for tab in self.CHANNEL_TABS:
+            url = f"{self.base_channel_url}{channel_id}/{tab}"
+            yield from self._harvest_browse(url, budget, channel_id, playlist_ids)
+        for playlist_id in playlist_ids[:self.MAX_CHANNEL_PLAYLISTS]:
+            yield from self._harvest_browse(self.base_playlist_url + playlist_id, budget, channel_id, playlist_ids)
+
+    def _harvest_browse(self, url, budget, channel_id, playlist_ids):
+        """
+        Parcourt une page browse (onglet de chaîne, playlist) et ses continuations.
+
+        Args:
+            budget (list): Requêtes restantes (partagé entre les pages d'une même chaîne)
+            playlist_ids (list): Reçoit les playlists rencontrées
+        """
+        if budget[0] <= 0:
+            return
+        budget[0] -= 1
+        page = self.fetch_page(url, "channel")
+        data = self._load_initial_data(page)
+        if not data:
+            return
+        try:
+            videos, token = self._extract_browse_items(data.get('contents', {}), channel_id, playlist_ids)
+        except Exception:
+            return  # Mise en page inattendue : page ignorée
+        yield videos
+
+        innertube = self._innertube_config(page)
+        while token and budget[0] > 0:
+            budget[0] -= 1
+            data = self._fetch_continuation(self.innertube_browse_url, token, innertube)
+            if not data:
+                return
+            try:
+                videos, token = self._extract_browse_items(data.get('onResponseReceivedActions', []), channel_id,
+                                                           playlist_ids)
+            except Exception:
+                return
+            yield videos
+
+    def _extract_browse_items(self, node, channel_id, playlist_ids):
+        """
+        Extrait les vidéos, les playlists et le jeton de continuation d'un
+        contenu browse, quelle que soit sa mise en page (grille, liste, étagère).
+
+        Returns:
+            tuple: (vidéos, jeton de continuation ou None)
+        """
+        videos = []
+        token = None
+        for name, v in self._iter_renderers(node, self.BROWSE_RENDERERS):
+            if name == 'continuationItemRenderer':
+                token = v.get('continuationEndpoint', {}).get('continuationCommand', {}).get('token') or token
+                continue
+            if name == 'gridPlaylistRenderer':
+                if v.get('playlistId'):
+                    playlist_ids.append(v['playlistId'])
+                continue
+            if name == 'lockupViewModel':
+                if v.get('contentType') == 'LOCKUP_CONTENT_TYPE_PLAYLIST' and v.get('contentId'):
+                    playlist_ids.append(v['contentId'])
+                continue
+
+            try:
+                if name == 'shortsLockupViewModel':
+                    video = self._extract_shorts_lockup(v)
+                elif name == 'reelItemRenderer':
+                    video = self._extract_video_info(dict(v, title=v.get('headline', {})), is_short=True)
+                elif name == 'playlistVideoRenderer':
+                    video = self._extract_video_info(self._normalize_playlist_video(v))
+                else:
+                    video = self._extract_video_info(v)
+            except Exception:
+                # Renderer inattendu : seule cette vidéo est ignorée
+                continue
+            if not video.videoId:
+                continue
+            # Les vidéos d'un onglet de chaîne ne portent pas le propriétaire
+            if not video.channelId:
+                video.channelId = channel_id
+            videos.append(video)
+        return videos, token
+
+    @staticmethod
+    def _iter_renderers(node, names):
+        """Parcourt un arbre JSON et retourne (nom, renderer) pour chaque clé de `names`, dans l'ordre"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, tuple):
+                yield node
+            elif isinstance(node, dict):
+                children = []
+                for key, value in node.items():
+                    if key in names and isinstance(value, dict):
+                        children.append((key, value))
+                    elif isinstance(value, (dict, list)):
+                        children.append(value)
+                stack.extend(reversed(children))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+
+    def _extract_shorts_lockup(self, v):
+        """Extrait un short du format shortsLockupViewModel (onglet shorts des chaînes)"""
+        video_id = v.get('onTap', {}).get('innertubeCommand', {}).get('reelWatchEndpoint', {}).get('videoId', '')
+        overlay = v.get('overlayMetadata', {})
+        title = overlay.get('primaryText', {}).get('content', '')
+        views = self._parse_views(overlay.get('secondaryText', {}).get('content', ''))
+        # Durée absente de ce format : None pour qu'elle ne soit pas filtrée
+        return VideoRecord(video_id, title, views=views, duration=None, is_short=True)
+
+    @staticmethod
+    def _normalize_playlist_video(v):
+        """Ramène les vues et la date d'un playlistVideoRenderer (videoInfo) au format videoRenderer"""
+        info = [run.get('text', '') for run in v.get('videoInfo', {}).get('runs', [])]
+        v = dict(v)
+        if info:
+            v['viewCountText'] = {'simpleText': info[0]}
+        if len(info) > 2:
+            v['publishedTimeText'] = {'simpleText': info[-1]}
+        return v
+
+    @classmethod
+    def extract_videos(cls, page):
+        """
+        Extrait les vidéos d'une page de recherche ou de vidéo.
+
+        Args:
+            page (str|bytes|BeautifulSoup): HTML brut (chemin rapide) ou soupe déjà construite
+
+        Returns:
+            list: Vidéos trouvées dans ytInitialData
+        """
+        try:
+            data = cls._load_initial_data(page)
+            if not data:
                 return []
-            
-            script_content = script.string
-            json_match = re.search(r'var ytInitialData = ({.*?});', script_content)
+            return cls._extract_videos_from_data(data)
+        except Exception:
+            return []
+
+    @classmethod
+    def _load_initial_data(cls, page):
+        """Décode ytInitialData, directement depuis le texte brut si possible"""
+        if not page:
+            return None
+        if isinstance(page, (str, bytes, bytearray)):
+            data = extract_initial_data(page)
+            if data is not None:
+                return data
+            # Repli : construire le DOM si l'affectation n'a pas été trouvée telle quelle
+            if isinstance(page, (bytes, bytearray)):
+                page = page.decode('utf-8', errors='replace')
+            page = bs4.BeautifulSoup(page, "html.parser")
+        return cls._initial_data_from_soup(page)
+
+    @classmethod
+    def _initial_data_from_soup(cls, soup):
+        """Ancienne méthode d'extraction via BeautifulSoup"""
+        try:
+            script = soup.find('script', string=re.compile('ytInitialData'))
+            if not script or not script.string:
+                return None
+            data = extract_initial_data(script.string)
+            if data is not None:
+                return data
+            json_match = re.search(r'var ytInitialData = ({.*?});', script.string)
             if not json_match:
-                return []
-            
-            data = json.loads(json_match.group(1))
-            videos = []
-            
-            # Cas 1: Page de recherche
-            search_contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
-            
-            if search_contents:
-                for section in search_contents:
-                    for item in section.get('itemSectionRenderer', {}).get('contents', []):
-                        v = item.get('videoRenderer') or item.get('compactVideoRenderer')
-                        if v:
-                            videos.append(self._extract_video_info(v))
-            
-            # Cas 2: Page de vidéo - vidéos recommandées dans la colonne secondaire
-            secondary_results = data.get('contents', {}).get('twoColumnWatchNextResults', {}).get('secondaryResults', {}).get('secondaryResults', {}).get('results', [])
-            
-            if secondary_results:
-                for item in secondary_results:
-                    # Vidéos dans compactVideoRenderer
-                    v = item.get('compactVideoRenderer')
-                    if v:
-                        videos.append(self._extract_video_info(v))
-                    
-                    # Vidéos dans reel shelf (shorts)
-                    reel_shelf = item.get('reelShelfRenderer')
-                    if reel_shelf:
-                        for reel_item in reel_shelf.get('items', []):
-                            v = reel_item.get('reelItemRenderer')
-                            if v:
-                                videos.append(self._extract_video_info(v, is_short=True))
-                    
-                    # Vidéos dans shelf renderer
-                    shelf = item.get('shelfRenderer')
-                    if shelf:
-                        shelf_content = shelf.get('content', {}).get('verticalListRenderer', {}).get('items', [])
-                        for shelf_item in shelf_content:
-                            v = shelf_item.get('compactVideoRenderer')
-                            if v:
-                                videos.append(self._extract_video_info(v))
-            
-            # Cas 3: EndScreen videos (vidéos suggérées à la fin)
-            endscreen = data.get('playerOverlays', {}).get('playerOverlayRenderer', {}).get('endScreen', {}).get('watchNextEndScreenRenderer', {}).get('results', [])
-            
-            for item in endscreen:
-                v = item.get('endScreenVideoRenderer')
+                return None
+            return json.loads(json_match.group(1))
+        except (json.JSONDecodeError, AttributeError):
+            return None
+
+    @classmethod
+    def _extract_videos_from_data(cls, data):
+        """Parcourt les renderers de ytInitialData et retourne les vidéos trouvées"""
+        videos = []
+        
+        # Cas 1: Page de recherche
+        search_contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {}).get('sectionListRenderer', {}).get('contents', [])
+        
+        if search_contents:
+            videos.extend(cls._extract_search_items(search_contents)[0])
+        
+        # Cas 2: Page de vidéo - vidéos recommandées dans la colonne secondaire
+        secondary_results = data.get('contents', {}).get('twoColumnWatchNextResults', {}).get('secondaryResults', {}).get('secondaryResults', {}).get('results', [])
+        
+        if secondary_results:
+            for item in secondary_results:
+                # Vidéos dans compactVideoRenderer
+                v = item.get('compactVideoRenderer')
                 if v:
-                    videos.append(self._extract_video_info(v))
-            
-            return videos
-            
-        except (json.JSONDecodeError, Exception) as e:
-            return []
+                    videos.append(cls._extract_video_info(v))
+                
+                # Vidéos dans reel shelf (shorts)
+                reel_shelf = item.get('reelShelfRenderer')
+                if reel_shelf:
+                    for reel_item in reel_shelf.get('items', []):
+                        v = reel_item.get('reelItemRenderer')
+                        if v:
+                            videos.append(cls._extract_video_info(v, is_short=True))
+                
+                # Vidéos dans shelf renderer
+                shelf = item.get('shelfRenderer')
+                if shelf:
+                    shelf_content = shelf.get('content', {}).get('verticalListRenderer', {}).get('items', [])
+                    for shelf_item in shelf_content:
+                        v = shelf_item.get('compactVideoRenderer')
+                        if v:
+                            videos.append(cls._extract_video_info(v))
+        
+        # Cas 3: EndScreen videos (vidéos suggérées à la fin)
+        endscreen = data.get('playerOverlays', {}).get('playerOverlayRenderer', {}).get('endScreen', {}).get('watchNextEndScreenRenderer', {}).get('results', [])
+        
+        for item in endscreen:
+            v = item.get('endScreenVideoRenderer')
+            if v:
+                videos.append(cls._extract_video_info(v))
+        
+        return videos
     
-    def _extract_video_info(self, v, is_short=False):
+    @classmethod
+    def _extract_video_info(cls, v, is_short=False):
         """Extrait les informations d'une vidéo depuis le renderer"""
         video_id = v.get('videoId', '')
         
@@ -345,49 +1289,42 @@ class YoutubeCrawler(Crawler):
         if 'viewCountText' in v:
             if isinstance(v['viewCountText'], dict):
                 views_text = v['viewCountText'].get('simpleText', '') or v['viewCountText'].get('runs', [{}])[0].get('text', '')
-                views = self._parse_views(views_text)
+                views = cls._parse_views(views_text)
         elif 'shortViewCountText' in v:
             if isinstance(v['shortViewCountText'], dict):
                 views_text = v['shortViewCountText'].get('simpleText', '') or v['shortViewCountText'].get('runs', [{}])[0].get('text', '')
-                views = self._parse_views(views_text)
+                views = cls._parse_views(views_text)
         
-        # Durée
-        duration = 0
+        # Durée (None si absente, ex. shorts du reelItemRenderer : complétée par l'enricher)
+        duration = None
         if 'lengthText' in v:
             duration_text = v['lengthText'].get('simpleText', '')
-            duration = self._parse_duration(duration_text)
+            duration = cls._parse_duration(duration_text)
         
         # Date de publication
-        published_time = None
+        published_time_text = None
+        published_timestamp = None
         if 'publishedTimeText' in v:
-            published_time_text = v['publishedTimeText'].get('simpleText', '')
-            published_time = self._parse_published_time(published_time_text)
+            published_time_text = v['publishedTimeText'].get('simpleText', '') or None
+            published_date = cls._parse_published_datetime(published_time_text)
+            if published_date:
+                published_timestamp = published_date.timestamp()
         
-        # Miniature
-        thumbnail = ''
-        if 'thumbnail' in v and 'thumbnails' in v['thumbnail']:
-            thumbnails = v['thumbnail']['thumbnails']
-            if thumbnails:
-                thumbnail = thumbnails[-1].get('url', '')
-        
-        # URL de la vidéo
-        url = f"{self.base_video_url}{video_id}" if video_id else ''
-        if is_short and video_id:
-            url = f"https://www.youtube.com/shorts/{video_id}"
-        
-        return {
-            'videoId': video_id,
-            'title': title,
-            'channel': channel,
-            'channelId': channel_id,
-            'views': views,  # Nombre entier de vues
-            'publishedTime': published_time,  # Date ISO string ou texte original
-            'duration': duration,  # Durée en secondes (entier)
-            'thumbnail': thumbnail,
-            'url': url
-        }
+        # L'URL, la miniature et la date ISO sont dérivées à la demande (VideoRecord)
+        return VideoRecord(
+            video_id,
+            title,
+            channel,
+            channel_id,
+            views,  # Nombre entier de vues
+            duration,  # Durée en secondes (entier)
+            published_timestamp,  # Timestamp epoch (None si date non reconnue)
+            published_time_text,  # Texte original, gardé seulement si la date n'est pas reconnue
+            is_short,
+        )
 
-    def _parse_views(self, views_text):
+    @classmethod
+    def _parse_views(cls, views_text):
         """Convertit le texte des vues en nombre entier"""
         if not views_text:
             return 0
@@ -409,7 +1346,8 @@ class YoutubeCrawler(Crawler):
         except (ValueError, AttributeError):
             return 0
 
-    def _parse_duration(self, duration_text):
+    @classmethod
+    def _parse_duration(cls, duration_text):
         """Convertit la durée en secondes"""
         if not duration_text:
             return 0
@@ -425,33 +1363,13 @@ class YoutubeCrawler(Crawler):
         except (ValueError, AttributeError):
             return 0
 
-    def _parse_published_time(self, time_text):
-        """Convertit le texte de la date de publication en chaîne ISO datetime"""
+    @classmethod
+    def _parse_published_datetime(cls, time_text):
+        """Convertit le texte relatif de la date de publication en datetime (None si non reconnu)"""
         if not time_text:
             return None
-        from datetime import datetime, timedelta
-        now = datetime.now()
-        
-        # Parse le texte pour obtenir la date
-        published_date = now
-        
-        if 'hour' in time_text or 'hours' in time_text:
-            hours = int(time_text.split()[0])
-            published_date = now - timedelta(hours=hours)
-        elif 'day' in time_text or 'days' in time_text:
-            days = int(time_text.split()[0])
-            published_date = now - timedelta(days=days)
-        elif 'week' in time_text or 'weeks' in time_text:
-            weeks = int(time_text.split()[0])
-            published_date = now - timedelta(weeks=weeks)
-        elif 'month' in time_text or 'months' in time_text:
-            months = int(time_text.split()[0])
-            published_date = now - timedelta(days=months*30)
-        elif 'year' in time_text or 'years' in time_text:
-            years = int(time_text.split()[0])
-            published_date = now - timedelta(days=years*365)
-        else:
-            return time_text  # Retourne le texte original si non reconnu
-        
-        # Retourne la date au format ISO
-        return published_date.isoformat()
+        # Le nombre n'est pas toujours en tête ("Streamed 3 days ago", "Premiered 2 weeks ago")
+        match = _RELATIVE_DATE.search(time_text)
+        if not match:
+            return None
+        return datetime.now() - int(match.group(1)) * _RELATIVE_DATE_UNITS[match.group(2)]
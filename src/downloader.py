@@ -1,8 +1,344 @@
 """Module de téléchargement YouTube avec yt-dlp"""
 
+import asyncio
 import os
+import re
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from yt_dlp import YoutubeDL
+from yt_dlp.utils import download_range_func
+
+try:
+    # ffmpeg fourni avec moviepy : fusion des flux et découpe des extraits sans ffmpeg dans le PATH
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
+
+# Identifiant vidéo dans les URLs watch?v=, /shorts/ et youtu.be/
+_VIDEO_ID = re.compile(r"(?:[?&]v=|/shorts/|youtu\.be/)([\w-]{11})")
+
+
+def video_id_from_url(url):
+    """Identifiant YouTube extrait d'une URL (None s'il n'est pas reconnu)"""
+    match = _VIDEO_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+class TargetProfile:
+    """
+    Format attendu par l'éditeur, qui réencode tout à la hauteur de sortie
+    (Editor.add_entertainment_video(..., height=...)) : au lieu du meilleur
+    débit, yt-dlp choisit le plus petit format qui atteint cette hauteur,
+    avec le codec préféré, puis fusionne vidéo et audio dans le conteneur
+    demandé.
+    """
+
+    def __init__(self, height, vcodec="h264", container="mp4"):
+        """
+        Args:
+            height (int): Hauteur des montages en pixels (1920 pour un short 1080x1920)
+            vcodec (str): Codec vidéo préféré à hauteur égale (décodage le moins coûteux)
+            container (str): Conteneur de sortie
+        """
+        self.height = height
+        self.vcodec = vcodec
+        self.container = container
+
+    @classmethod
+    def for_height(cls, height, **kwargs):
+        """Profil d'une hauteur de montage ; None (hauteur de la source) : pas de profil, ancien sélecteur"""
+        return cls(height, **kwargs) if height else None
+
+    @property
+    def key(self):
+        """Identifiant du profil (clé du cache de vidéos)"""
+        return f"profile:{self.height}:{self.vcodec}:{self.container}"
+
+    def ydl_options(self):
+        options = {
+            'format': 'bv*+ba/b',
+            # Hauteur la plus proche de la cible sans la dépasser, puis codec, puis taille la plus faible
+            'format_sort': [f'height:{self.height}', f'vcodec:{self.vcodec}', '+size', '+br'],
+            'merge_output_format': self.container,
+        }
+        if imageio_ffmpeg is not None:
+            options['ffmpeg_location'] = imageio_ffmpeg.get_ffmpeg_exe()
+        return options
+
+
+def selected_format_size(info, format_selector):
+    """
+    Taille (octets) du format que `format_selector` aurait choisi avec le tri par
+    défaut de yt-dlp, référence des octets économisés par un TargetProfile (0 si inconnue).
+    """
+    formats = [dict(f) for f in info.get('formats') or []]
+    if not formats:
+        return 0
+    with YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+        ydl.sort_formats({'formats': formats, '_format_sort_fields': info.get('_format_sort_fields')})
+        selector = ydl.build_format_selector(format_selector)
+        chosen = next(iter(selector({
+            'formats': formats,
+            'has_merged_format': any('none' not in (f.get('acodec'), f.get('vcodec')) for f in formats),
+            'incomplete_formats': (all(f.get('vcodec') == 'none' for f in formats)
+                                   or all(f.get('acodec') == 'none' for f in formats)),
+        })), None)
+    if not chosen:
+        return 0
+    return sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in chosen.get('requested_formats') or [chosen])
+
+
+class DownloadStalled(Exception):
+    """Téléchargement interrompu : aucune donnée reçue ou débit sous le minimum trop longtemps"""
+
+
+class DownloadProgress:
+    """
+    Avancement d'une tentative de téléchargement, alimenté par le hook de progression de yt-dlp.
+
+    Seuls les octets reçus pendant cette tentative sont comptés : une relance
+    reprend le fichier partiel (et saute les fichiers déjà terminés d'un format
+    fusionné), dont yt-dlp rapporte la taille totale sur le disque.
+
+    L'extraction (page, player, signatures) précède le premier hook et ne
+    compte pas : le délai sans donnée part du premier hook `downloading`,
+    le délai avant le premier octet aussi, et la fenêtre de débit minimal
+    du premier octet.
+    """
+
+    def __init__(self, download_id, attempt=1, resumed=None):
+        """
+        Args:
+            resumed (dict): Fichier -> octets déjà sur le disque au début de la tentative
+                (`on_disk` de la tentative précédente)
+        """
+        self.download_id = download_id
+        self.attempt = attempt
+        self.resumed = dict(resumed or {})
+        self.on_disk = dict(self.resumed)  # Fichier -> octets sur le disque, rapportés par yt-dlp
+        self.status = "starting"
+        self.started_at = time.monotonic()
+        self.transfer_started_at = None  # Premier hook "downloading"
+        self.first_byte_at = None
+        self.last_progress_at = None
+        self.finished_bytes = 0  # Fichiers déjà terminés (vidéo puis audio pour un format fusionné)
+        self.current_bytes = 0
+        self.total_bytes = None
+        self.speed = None
+        self.eta = None
+        self._window_start = None
+        self._window_bytes = 0
+
+    @property
+    def downloaded_bytes(self):
+        return self.finished_bytes + self.current_bytes
+
+    @property
+    def ttfb(self):
+        """Délai entre le début du transfert et le premier octet (secondes), None tant qu'aucun octet n'est arrivé"""
+        return self.first_byte_at - self.transfer_started_at if self.first_byte_at is not None else None
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    @property
+    def transfer_elapsed(self):
+        """Durée du transfert, extraction exclue (0 tant qu'il n'a pas commencé)"""
+        return time.monotonic() - self.transfer_started_at if self.transfer_started_at is not None else 0.0
+
+    def idle_for(self):
+        """Secondes sans nouvelle donnée depuis le début du transfert, None pendant l'extraction"""
+        return time.monotonic() - self.last_progress_at if self.last_progress_at is not None else None
+
+    def update(self, d):
+        now = time.monotonic()
+        self.status = d.get("status", self.status)
+        downloaded = d.get("downloaded_bytes") or 0
+        filename = d.get("filename")
+        resumed = self.resumed.get(filename, 0)
+        if self.status == "finished":
+            total = d.get("total_bytes") or downloaded
+            self.finished_bytes += max(total - resumed, 0)
+            self.on_disk[filename] = total
+            self.current_bytes = 0
+            return
+        if self.transfer_started_at is None:
+            self.transfer_started_at = self.last_progress_at = now
+        progressed = downloaded > self.on_disk.get(filename, resumed)
+        self.on_disk[filename] = downloaded
+        self.current_bytes = max(downloaded - resumed, 0)
+        if progressed:
+            if self.first_byte_at is None:
+                # Le débit minimal se mesure à partir du premier octet
+                self.first_byte_at = now
+                self._window_start, self._window_bytes = now, self.downloaded_bytes
+            self.last_progress_at = now
+        self.total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate") or self.total_bytes
+        self.speed = d.get("speed")
+        self.eta = d.get("eta")
+
+    def window_speed(self, window):
+        """
+        Débit moyen (octets/s) sur la dernière fenêtre de `window` secondes, None avant le
+        premier octet ou tant que la fenêtre n'est pas écoulée.
+        """
+        if self._window_start is None:
+            return None
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < window:
+            return None
+        speed = (self.downloaded_bytes - self._window_bytes) / elapsed
+        self._window_start, self._window_bytes = now, self.downloaded_bytes
+        return speed
+
+    def snapshot(self):
+        ttfb = self.ttfb
+        return {
+            "download_id": self.download_id,
+            "attempt": self.attempt,
+            "status": self.status,
+            "elapsed_s": self.elapsed,
+            "bytes": self.downloaded_bytes,
+            "total_bytes": self.total_bytes,
+            "speed_bps": self.speed,
+            "eta_s": self.eta,
+            "ttfb_ms": ttfb * 1000 if ttfb is not None else None,
+        }
+
+
+class DownloadStats:
+    """Statistiques de débit des téléchargements (en cours et cumulées), pour le suivi de la chaîne"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = {}  # download_id -> DownloadProgress
+        self.downloads = 0
+        self.failed = 0
+        self.stalls = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.ttfb_total = 0.0
+        self.ttfb_count = 0
+        self.max_ttfb = 0.0
+
+    def start(self, download_id, attempt=1, resumed=None):
+        progress = DownloadProgress(download_id, attempt, resumed)
+        with self._lock:
+            self._active[download_id] = progress
+        return progress
+
+    def finish(self, progress, success, stalled=False, retrying=False):
+        """Clôt une tentative de téléchargement"""
+        with self._lock:
+            self._active.pop(progress.download_id, None)
+            self.bytes += progress.downloaded_bytes
+            self.seconds += progress.transfer_elapsed
+            if progress.ttfb is not None:
+                self.ttfb_total += progress.ttfb
+                self.ttfb_count += 1
+                self.max_ttfb = max(self.max_ttfb, progress.ttfb)
+            if stalled:
+                self.stalls += 1
+            if retrying:
+                self.retries += 1
+            elif success:
+                self.downloads += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "downloads": self.downloads,
+                "failed": self.failed,
+                "stalls": self.stalls,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "throughput_bps": self.bytes / self.seconds if self.seconds else 0.0,
+                "avg_ttfb_ms": self.ttfb_total / self.ttfb_count * 1000 if self.ttfb_count else 0.0,
+                "max_ttfb_ms": self.max_ttfb * 1000,
+                "active": [progress.snapshot() for progress in self._active.values()],
+            }
+
+
+class DownloadSession:
+    """
+    Instances YoutubeDL initialisées une fois et réutilisées d'un téléchargement à l'autre.
+
+    Une instance est gardée par thread et par jeu d'options : les extracteurs,
+    les cookies, les connexions HTTP et les données du player (fonctions de
+    signature, en mémoire et dans `cachedir` sur disque) ne sont préparés
+    qu'au premier téléchargement. Les hooks de progression, propres à chaque
+    téléchargement, passent par un relais du thread courant.
+    """
+
+    def __init__(self, cachedir="src/media/cache/yt-dlp"):
+        """
+        Args:
+            cachedir (str): Cache disque de yt-dlp (player, signatures) partagé entre les lancements
+        """
+        self.cachedir = cachedir
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instances = []
+
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _options_key(ydl_opts):
+        return repr(sorted(ydl_opts.items()))
+
+    @contextmanager
+    def use(self, ydl_opts, progress_hook=None):
+        """
+        Instance YoutubeDL du thread courant pour ces options (créée au premier usage).
+
+        Args:
+            ydl_opts (dict): Options yt-dlp, sans progress_hooks
+            progress_hook (callable): Hook de progression de ce téléchargement
+        """
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+        key = self._options_key(ydl_opts)
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = YoutubeDL(dict(ydl_opts, cachedir=self.cachedir, progress_hooks=[self._relay_progress]))
+            instances[key] = ydl
+            with self._lock:
+                self._instances.append(ydl)
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        self._local.progress_hook = progress_hook
+        try:
+            yield ydl
+        finally:
+            self._local.progress_hook = None
+
+    def _relay_progress(self, d):
+        hook = getattr(self._local, "progress_hook", None)
+        if hook is not None:
+            hook(d)
+
+    def stats(self):
+        with self._lock:
+            return {"instances": self.created, "reused": self.reused}
+
+    def close(self):
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for ydl in instances:
+            ydl.close()
+
 
 class Downloader:
     def __init__(self, download_dir="src/media/download"):
@@ -12,47 +348,349 @@ class Downloader:
             os.makedirs(self.download_dir)
 
 class YouTubeDownloader(Downloader):
-    def __init__(self, download_dir="src/media/download"):
+    def __init__(self, download_dir="src/media/download", rate_limit=None, media_cache=None, session=None,
+                 profile=None, min_speed=None, stall_timeout=None, stall_retries=1, speed_window=10, stats=None,
+                 player_skip=False):
+        """
+        Args:
+            rate_limit (int): Débit maximal de ce téléchargement en octets/s (None : illimité)
+            media_cache (MediaCache): Cache des vidéos par identifiant et format (None : pas de cache)
+            session (DownloadSession): Instances YoutubeDL réutilisées (None : une instance par téléchargement)
+            profile (TargetProfile): Plus petit format suffisant pour l'éditeur (None : sélecteur `quality`)
+            min_speed (int): Débit minimal en octets/s sur `speed_window` secondes (None : pas de minimum)
+            stall_timeout (float): Secondes sans donnée reçue avant abandon (None : délais de yt-dlp)
+            stall_retries (int): Nouvelles tentatives après un téléchargement bloqué, avant de l'abandonner
+            speed_window (float): Fenêtre de mesure du débit minimal (secondes)
+            stats (DownloadStats): Statistiques de débit partagées (propres à ce téléchargement par défaut)
+            player_skip (bool): Ne demander à yt-dlp que le player, sans page vidéo ni données
+                initiales (une requête de moins ; certains formats ou vidéos peuvent manquer)
+        """
         self.download_dir = download_dir
+        self.profile = profile
+        self.rate_limit = rate_limit
+        self.media_cache = media_cache
+        self.session = session
+        self.min_speed = min_speed
+        self.stall_timeout = stall_timeout
+        self.stall_retries = stall_retries
+        self.speed_window = speed_window
+        self.player_skip = player_skip
+        self.stats = stats if stats is not None else DownloadStats()
+        self.progress = None
         self.download_id = str(uuid.uuid4())
         if not os.path.exists(self.download_dir):
             os.makedirs(self.download_dir)
     
-    def download(self, url, quality='best'):
+    def download(self, url, quality='best', video_id=None, section=None):
+        """
+        Télécharge une vidéo, ou la resservit depuis le cache si elle y est déjà dans ce format.
+
+        Args:
+            url (str|dict): URL de la vidéo, ou dict avec 'url' ou 'videoId'
+            quality (str): Qualité demandée ('best' ou hauteur maximale)
+            video_id (str): Identifiant YouTube (extrait de l'URL par défaut), clé du cache
+            section (tuple): (début, fin) en secondes : seul cet extrait est téléchargé. L'extrait
+                passe par ffmpeg, qui ne remonte que de rares progress hooks : la détection des
+                blocages (stall_timeout, min_speed) y est dégradée
+
+        Returns:
+            dict: 'success', 'download_id', 'path' (fichier téléchargé), 'cached' (fichier
+                du cache, à ne pas supprimer après usage), 'cache_hit' (aucun téléchargement),
+                'bytes' (taille téléchargée) et 'bytes_saved' (par rapport au format du sélecteur `quality`) ;
+                'stalled' si le téléchargement a été abandonné faute de débit
+        """
         try:
             if isinstance(url, dict):
+                video_id = video_id or url.get('videoId')
                 video_url = url.get('url') or f"https://www.youtube.com/watch?v={url.get('videoId')}"
                 if not video_url:
                     return {'success': False, 'error': 'Aucune URL trouvée', 'download_id': self.download_id}
             else:
                 video_url = url
+            video_id = video_id or video_id_from_url(video_url)
             
             format_selector = 'best[ext=mp4]/best' if quality == 'best' else \
                             f'best[height<={quality}][ext=mp4]/best[height<={quality}]/best' if quality.isdigit() else \
                             'best'
             
+            # Clé du format dans le cache : sélecteur ou profil, et extrait éventuel
+            format_key = self.profile.key if self.profile is not None else format_selector
+            if section:
+                format_key += f"|{section[0]}-{section[1]}"
+            
+            use_cache = self.media_cache is not None and video_id is not None
+            if use_cache:
+                cached_path = self.media_cache.get(video_id, format_key)
+                if cached_path:
+                    return {'success': True, 'download_id': self.download_id, 'path': cached_path,
+                            'cached': True, 'cache_hit': True, 'bytes': 0, 'bytes_saved': 0}
+                outtmpl = self.media_cache.output_template(format_key)
+            else:
+                outtmpl = os.path.join(self.download_dir, '%(id)s.%(ext)s')
+            
             ydl_opts = {
                 'format': format_selector,
-                'outtmpl': os.path.join(self.download_dir, f'{self.download_id}.%(ext)s'),
+                'outtmpl': outtmpl,
                 'quiet': True,
                 'no_warnings': True,
-                'progress_hooks': [self._progress_hook],
                 'prefer_free_formats': True,
                 'noplaylist': True,
             }
+            if self.profile is not None:
+                ydl_opts.update(self.profile.ydl_options())
+            if section:
+                ydl_opts['download_ranges'] = download_range_func(None, [tuple(section)])
+            if self.rate_limit:
+                ydl_opts['ratelimit'] = self.rate_limit
+            if self.stall_timeout:
+                ydl_opts['socket_timeout'] = self.stall_timeout
+            if self.player_skip:
+                # Ni page vidéo ni données initiales, seulement le player
+                ydl_opts['extractor_args'] = {'youtube': {'player_skip': ['webpage', 'initial_data']}}
+            
+            # Un téléchargement bloqué est relancé (yt-dlp reprend le fichier partiel), puis abandonné
+            attempts = self.stall_retries + 1
+            resumed = None
+            for attempt in range(1, attempts + 1):
+                self.progress = self.stats.start(self.download_id, attempt, resumed)
+                try:
+                    info, path = self._run(ydl_opts, video_url)
+                except DownloadStalled as e:
+                    retrying = attempt < attempts
+                    self.stats.finish(self.progress, False, stalled=True, retrying=retrying)
+                    if not retrying:
+                        return {'success': False, 'error': f"Téléchargement bloqué: {e}",
+                                'download_id': self.download_id, 'stalled': True}
+                    # La relance ne compte que les octets qu'elle ajoute aux fichiers déjà sur le disque
+                    resumed = self.progress.on_disk
+                    continue
+                except Exception:
+                    self.stats.finish(self.progress, False)
+                    raise
+                self.stats.finish(self.progress, True)
+                break
             
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=True)
-                return {
-                    'success': True,
-                    'download_id': self.download_id
-                }
+            if use_cache:
+                self.media_cache.put(video_id, format_key, path)
+            size = os.path.getsize(path)
+            # Référence : format qu'aurait choisi le sélecteur `quality` pour la vidéo entière ;
+            # négatif si le profil demande plus (formats combinés limités en résolution)
+            reference_size = selected_format_size(info, format_selector) if self.profile is not None or section else 0
+            return {
+                'success': True,
+                'download_id': self.download_id,
+                'path': path,
+                'cached': use_cache,
+                'cache_hit': False,
+                'bytes': size,
+                'bytes_saved': reference_size - size if reference_size else 0
+            }
                 
         except Exception as e:
             return {'success': False, 'error': str(e), 'download_id': self.download_id}
     
+    def _run(self, ydl_opts, video_url):
+        try:
+            if self.session is not None:
+                with self.session.use(ydl_opts, self._progress_hook) as ydl:
+                    return self._extract(ydl, video_url)
+            with YoutubeDL(dict(ydl_opts, progress_hooks=[self._progress_hook])) as ydl:
+                return self._extract(ydl, video_url)
+        except DownloadStalled:
+            raise
+        except Exception as e:
+            # Connexion muette : le hook n'est plus appelé et c'est le délai de lecture
+            # (socket_timeout = stall_timeout) qui fait échouer yt-dlp, sans exception typée
+            idle = self.progress.idle_for() if self.progress is not None else None
+            if self.stall_timeout and idle is not None and idle >= self.stall_timeout:
+                raise DownloadStalled(f"aucune donnée depuis {self.stall_timeout} s") from e
+            raise
+    
+    @staticmethod
+    def _extract(ydl, video_url):
+        """Télécharge la vidéo ; retourne les infos yt-dlp et le chemin final exact (après fusion des flux)"""
+        info = ydl.extract_info(video_url, download=True)
+        downloads = info.get('requested_downloads') or [{}]
+        return info, downloads[0].get('filepath') or ydl.prepare_filename(info)
+    
     def _progress_hook(self, d):
-        pass
+        """Met à jour l'avancement et interrompt le téléchargement (DownloadStalled) s'il est trop lent"""
+        progress = self.progress
+        if progress is None:
+            return
+        progress.update(d)
+        if d.get('status') != 'downloading':
+            return
+        if self.stall_timeout and progress.idle_for() > self.stall_timeout:
+            raise DownloadStalled(f"aucune donnée depuis {self.stall_timeout} s")
+        if self.min_speed:
+            speed = progress.window_speed(self.speed_window)
+            if speed is not None and speed < self.min_speed:
+                raise DownloadStalled(f"{speed / 1000:.1f} Ko/s sur {self.speed_window} s "
+                                      f"(minimum {self.min_speed / 1000:.1f} Ko/s)")
+
+
+class DownloadPool:
+    """
+    Téléchargements yt-dlp concurrents (un YouTubeDownloader par vidéo).
+
+    Le nombre de téléchargements simultanés est borné par `workers`, et le
+    débit total par `max_bandwidth`, réparti à parts égales entre les
+    workers (option ratelimit de yt-dlp). Chaque téléchargement est désigné
+    par son download_id ; ceux encore en file d'attente peuvent être annulés.
+    """
+
+    def __init__(self, workers=3, max_bandwidth=None, download_dir="src/media/download", media_cache=None,
+                 session=None, profile=None, min_speed=None, stall_timeout=None, stall_retries=1, player_skip=False):
+        """
+        Args:
+            workers (int): Téléchargements simultanés
+            max_bandwidth (int): Débit total maximal en octets/s (None : illimité)
+            download_dir (str): Dossier des vidéos téléchargées hors cache
+            media_cache (MediaCache): Cache des vidéos partagé par les téléchargements
+            session (DownloadSession): Instances YoutubeDL réutilisées par les workers (une nouvelle par défaut)
+            profile (TargetProfile): Profil de format des téléchargements (None : sélecteur `quality`)
+            min_speed (int): Débit minimal par téléchargement en octets/s, en dessous duquel il est relancé
+            stall_timeout (float): Secondes sans donnée reçue avant de relancer un téléchargement
+            stall_retries (int): Nouvelles tentatives d'un téléchargement bloqué avant de l'abandonner
+            player_skip (bool): Extraction yt-dlp allégée (player seul), désactivée par défaut
+        """
+        self.workers = workers
+        self.max_bandwidth = max_bandwidth
+        self.download_dir = download_dir
+        self.media_cache = media_cache
+        self.profile = profile
+        self.min_speed = min_speed
+        self.stall_timeout = stall_timeout
+        self.stall_retries = stall_retries
+        self.player_skip = player_skip
+        # Débit, délai avant le premier octet et blocages de tous les téléchargements
+        self.download_stats = DownloadStats()
+        self._owns_session = session is None
+        self.session = DownloadSession() if session is None else session
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download")
+        self._lock = threading.Lock()
+        self._futures = {}  # download_id -> Future du résultat de download()
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def submit(self, url, quality='best', video_id=None, section=None):
+        """
+        Met un téléchargement en file.
+
+        Args:
+            url (str|dict): URL de la vidéo, ou dict avec 'url' ou 'videoId'
+            quality (str): Qualité demandée ('best' ou hauteur maximale)
+            video_id (str): Identifiant YouTube (clé du cache)
+            section (tuple): (début, fin) en secondes de l'extrait à télécharger (via ffmpeg :
+                détection des blocages dégradée)
+
+        Returns:
+            str: download_id du téléchargement
+        """
+        rate_limit = self.max_bandwidth // self.workers if self.max_bandwidth else None
+        downloader = YouTubeDownloader(self.download_dir, rate_limit=rate_limit, media_cache=self.media_cache,
+                                       session=self.session, profile=self.profile, min_speed=self.min_speed,
+                                       stall_timeout=self.stall_timeout, stall_retries=self.stall_retries,
+                                       stats=self.download_stats, player_skip=self.player_skip)
+        future = self._executor.submit(downloader.download, url, quality, video_id, section)
+        future.add_done_callback(self._count)
+        with self._lock:
+            self._futures[downloader.download_id] = future
+            self.submitted += 1
+        return downloader.download_id
+
+    def _count(self, future):
+        with self._lock:
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.result()['success']:
+                self.succeeded += 1
+                self.bytes_downloaded += future.result()['bytes']
+                self.bytes_saved += future.result()['bytes_saved']
+            else:
+                self.failed += 1
+
+    def future(self, download_id):
+        """Future du résultat de download() (dict avec 'success' et 'download_id')"""
+        with self._lock:
+            return self._futures[download_id]
+
+    def cancel(self, download_id):
+        """
+        Annule un téléchargement pas encore commencé.
+
+        Returns:
+            bool: False si le téléchargement est déjà en cours ou terminé
+        """
+        with self._lock:
+            future = self._futures.get(download_id)
+        if future is None or not future.cancel():
+            return False
+        with self._lock:
+            del self._futures[download_id]
+        return True
+
+    def _snapshot(self):
+        with self._lock:
+            return {future: download_id for download_id, future in self._futures.items()}
+
+    def _forget(self, download_id):
+        """Retire un téléchargement terminé de la table (son résultat n'est rendu qu'une fois)"""
+        with self._lock:
+            self._futures.pop(download_id, None)
+
+    def results(self):
+        """
+        Résultats des téléchargements soumis, dans l'ordre où ils se terminent.
+
+        Yields:
+            dict: Résultat de YouTubeDownloader.download (avec 'download_id')
+        """
+        futures = self._snapshot()
+        for future in as_completed(futures):
+            self._forget(futures[future])
+            if not future.cancelled():
+                yield future.result()
+
+    async def aresults(self):
+        """Équivalent asynchrone de results()"""
+        pending = [asyncio.wrap_future(future) for future in self._snapshot()]
+        for next_done in asyncio.as_completed(pending):
+            try:
+                result = await next_done
+            except asyncio.CancelledError:
+                # Annulation de la tâche appelante : à propager ; annulation d'un téléchargement : ignorée
+                if asyncio.current_task().cancelling():
+                    raise
+                continue
+            self._forget(result['download_id'])
+            yield result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "bytes_downloaded": self.bytes_downloaded,
+                "bytes_saved": self.bytes_saved,
+                "session": self.session.stats(),
+                "transfer": self.download_stats.snapshot(),
+            }
+
+    def close(self, cancel_pending=False):
+        """Attend la fin des téléchargements (ou annule ceux en file d'attente)"""
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+        if self._owns_session:
+            self.session.close()
 
 if __name__ == "__main__":
     input_url = input("Enter the URL: ")
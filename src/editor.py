@@ -27,8 +27,15 @@ def suppress_stdout_stderr():
 
 class Editor:
     @staticmethod
-    def add_entertainment_video(download_id, duration=None):
-        download_dir = "src/media/download"
+    def add_entertainment_video(video_path, duration=None, keep_source=False, height=None):
+        """
+        Args:
+            video_path (str): Vidéo téléchargée (chemin rendu par YouTubeDownloader.download)
+            duration (float): Durée du montage (celle de la vidéo par défaut)
+            keep_source (bool): Ne pas supprimer la vidéo source (fichier du cache de vidéos)
+            height (int): Hauteur du montage en pixels, celle du TargetProfile de téléchargement
+                (celle de la vidéo par défaut)
+        """
         entertainment_dir = "src/media/entertainment_videos"
         output_dir = "src/media/videos"
         
@@ -37,18 +44,24 @@ class Editor:
         os.makedirs(output_dir, exist_ok=True)
         
         # Find main video
-        main_videos = glob.glob(os.path.join(download_dir, f"*{download_id}*.mp4"))
-        if not main_videos:
+        if not video_path or not os.path.exists(video_path):
             return None
         
-        main_video_path = main_videos[0]
+        main_video_path = video_path
         
         # Utiliser le context manager pour supprimer les sorties lors du chargement
         with suppress_stdout_stderr():
             main_clip = VideoFileClip(main_video_path)
         
-        if duration is None:
+        if duration is None or duration >= main_clip.duration:
             duration = main_clip.duration
+        else:
+            # Extrait : seul le début de la vidéo est monté (téléchargement partiel possible)
+            main_clip = main_clip.subclipped(0, duration)
+        
+        if height and main_clip.h != height:
+            # Sortie à la hauteur du profil de téléchargement, proportions conservées
+            main_clip = main_clip.resized(height=height)
         
         # Extract audio from main video
         main_audio = main_clip.audio
@@ -110,9 +123,9 @@ class Editor:
         entertainment_clip.close()
         final.close()
         
-        # Supprimer la vidéo originale après avoir terminé le montage
+        # Supprimer la vidéo originale après avoir terminé le montage (sauf si elle est en cache)
         try:
-            if os.path.exists(main_video_path):
+            if not keep_source and os.path.exists(main_video_path):
                 os.remove(main_video_path)
         except Exception:
             pass  # Ignorer silencieusement les erreurs
@@ -0,0 +1,293 @@
+"""Complément par lots des métadonnées manquantes ou approximatives des vidéos candidates"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+import requests
+
+# Durée ISO 8601 de l'API Data (ex. "PT1M5S")
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
+
+def parse_iso_duration(value):
+    """Convertit une durée ISO 8601 ("PT1M5S") en secondes (None si illisible)"""
+    match = _ISO_DURATION.fullmatch(value or "")
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_iso_date(value):
+    """Convertit une date ISO ("2024-05-01T12:00:00Z" ou "2024-05-01") en timestamp (None si illisible)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class MetadataCache:
+    """
+    Cache persistant (SQLite) des métadonnées exactes par identifiant vidéo.
+
+    Une vidéo introuvable est aussi enregistrée (valeurs nulles) pour ne pas
+    être redemandée à chaque crawl.
+    """
+
+    def __init__(self, path="src/media/cache/metadata.db"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "video_id TEXT PRIMARY KEY, duration INTEGER, published_timestamp REAL, views INTEGER, "
+            "fetched_at REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def get_many(self, video_ids):
+        """
+        Returns:
+            dict: Identifiant -> (durée, timestamp de publication, vues) des vidéos en cache
+        """
+        found = {}
+        video_ids = list(video_ids)
+        with self._lock:
+            # Par paquets pour rester sous la limite de paramètres de SQLite
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT video_id, duration, published_timestamp, views FROM metadata "
+                    f"WHERE video_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for video_id, duration, published_timestamp, views in rows:
+                    found[video_id] = (duration, published_timestamp, views)
+        return found
+
+    def put_many(self, metadata):
+        """Enregistre un dict identifiant -> (durée, timestamp de publication, vues)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?)",
+                [(video_id, *values, now) for video_id, values in metadata.items()],
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MetadataEnricher:
+    """
+    Résout, avant filtrage, la durée et la date exacte des candidates dont
+    ces champs manquent (shorts sans lengthText) ou sont approximatifs (date
+    relative proche d'une borne du filtre de date).
+
+    Seules les candidates que les filtres ne rejettent pas déjà sur leurs
+    champs connus (vues, date non ambiguë) sont complétées. Les identifiants
+    sont d'abord cherchés dans le cache persistant, puis demandés par lots
+    de 50 à l'API Data (videos.list, une unité de quota par lot) si une clé
+    est fournie, sinon à l'endpoint player d'innertube (une requête par
+    vidéo, PLAYER_WORKERS en parallèle). Une même vidéo demandée par
+    plusieurs threads n'est récupérée qu'une fois.
+    """
+
+    BATCH_SIZE = 50
+    # Requêtes player simultanées (repli sans clé)
+    PLAYER_WORKERS = 8
+    # Incertitude d'une date relative ("3 weeks ago") : seules les candidates
+    # dont la date est à moins de cette marge d'une borne sont vérifiées
+    DATE_MARGIN = 31 * 24 * 3600
+
+    def __init__(self, transport, routes, api_key=None, cache=None):
+        """
+        Args:
+            transport (HttpTransport): Session HTTP du crawler
+            routes (dict): Section du site de routes.json (URLs de l'API Data et du player)
+            api_key (str): Clé de l'API Data YouTube (requêtes par lots) ; sans clé, endpoint player
+            cache (MetadataCache): Cache persistant des métadonnées
+        """
+        self.transport = transport
+        self.videos_url = routes["data_api_videos_url"]
+        self.player_url = routes["innertube_player_url"]
+        self.api_key = api_key
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._in_flight = {}  # Identifiant -> Future des métadonnées en cours de récupération
+
+        self.candidates = 0
+        self.cache_hits = 0
+        self.fetched = 0
+        self.requests = 0
+        self.deduplicated = 0
+
+    def needs_enrichment(self, video, date_bounds=None):
+        """La durée manque, ou la date approximative est trop proche d'une borne du filtre"""
+        return video.get("duration") is None or self._ambiguous_date(video, date_bounds)
+
+    def _ambiguous_date(self, video, date_bounds):
+        """La date relative est trop proche d'une borne du filtre pour décider"""
+        timestamp = video.get("publishedTimestamp")
+        if timestamp is None or not date_bounds:
+            return False
+        return any(bound is not None and abs(timestamp - bound) < self.DATE_MARGIN for bound in date_bounds)
+
+    def enrich(self, videos, filters=None):
+        """
+        Complète en place les vidéos qui en ont besoin.
+
+        Args:
+            videos (list): Vidéos candidates (VideoRecord)
+            filters (CompiledFilters): Filtres du crawl (bornes de date)
+        """
+        date_bounds = filters.bounds("publishedTimestamp") if filters else None
+        pending = []
+        for video in videos:
+            ambiguous_date = self._ambiguous_date(video, date_bounds)
+            if video.get("duration") is not None and not ambiguous_date:
+                continue
+            # Une candidate déjà rejetée sur un champ connu n'est pas complétée ;
+            # une date ambiguë n'est testée qu'après complément
+            skip = ("publishedTimestamp",) if ambiguous_date else ()
+            if filters and not filters.accepts(video, skip):
+                continue
+            pending.append(video)
+        if not pending:
+            return
+        self.candidates += len(pending)
+
+        metadata = self.lookup({video["videoId"] for video in pending})
+        for video in pending:
+            values = metadata.get(video["videoId"])
+            if not values:
+                continue
+            duration, published_timestamp, views = values
+            if duration is not None:
+                video.duration = duration
+            if published_timestamp is not None:
+                video.publishedTimestamp = published_timestamp
+            # Les vues de la page crawlée sont plus récentes que celles du cache
+            if views and not video.get("views"):
+                video.views = views
+
+    def lookup(self, video_ids):
+        """
+        Métadonnées exactes d'un ensemble de vidéos (cache, puis réseau).
+
+        Returns:
+            dict: Identifiant -> (durée, timestamp de publication, vues)
+        """
+        found = self.cache.get_many(video_ids) if self.cache else {}
+        self.cache_hits += len(found)
+
+        # Réserver les identifiants manquants, ou attendre ceux déjà demandés par un autre thread
+        owned, waiting = {}, {}
+        with self._lock:
+            for video_id in video_ids:
+                if video_id in found:
+                    continue
+                future = self._in_flight.get(video_id)
+                if future is None:
+                    owned[video_id] = self._in_flight[video_id] = Future()
+                else:
+                    waiting[video_id] = future
+                    self.deduplicated += 1
+
+        if owned:
+            try:
+                fetched = self._fetch(list(owned))
+                if self.cache and fetched:
+                    self.cache.put_many(fetched)
+                found.update(fetched)
+            finally:
+                with self._lock:
+                    for video_id, future in owned.items():
+                        del self._in_flight[video_id]
+                        future.set_result(found.get(video_id))
+
+        for video_id, future in waiting.items():
+            values = future.result()
+            if values:
+                found[video_id] = values
+        return found
+
+    def _fetch(self, video_ids):
+        if self.api_key:
+            fetched = {}
+            for start in range(0, len(video_ids), self.BATCH_SIZE):
+                fetched.update(self._fetch_batch(video_ids[start:start + self.BATCH_SIZE]))
+            return fetched
+        with ThreadPoolExecutor(max_workers=min(self.PLAYER_WORKERS, len(video_ids))) as executor:
+            results = executor.map(self._fetch_player, video_ids)
+            return {video_id: values for video_id, values in zip(video_ids, results) if values}
+
+    def _fetch_batch(self, video_ids):
+        """Un appel videos.list pour au plus 50 vidéos"""
+        params = {
+            "part": "contentDetails,snippet,statistics",
+            "id": ",".join(video_ids),
+            "key": self.api_key,
+            "fields": "items(id,contentDetails/duration,snippet/publishedAt,statistics/viewCount)",
+        }
+        with self._lock:
+            self.requests += 1
+        try:
+            items = self.transport.get(self.videos_url, params=params).json().get("items", [])
+        except (requests.RequestException, ValueError):
+            return {}
+        fetched = {video_id: (None, None, None) for video_id in video_ids}  # Introuvables : mémorisés aussi
+        for item in items:
+            fetched[item["id"]] = (
+                parse_iso_duration(item.get("contentDetails", {}).get("duration")),
+                parse_iso_date(item.get("snippet", {}).get("publishedAt")),
+                int(item.get("statistics", {}).get("viewCount", 0)) or None,
+            )
+        with self._lock:
+            self.fetched += len(items)
+        return fetched
+
+    def _fetch_player(self, video_id):
+        """Repli sans clé : réponse JSON du player innertube pour une vidéo"""
+        payload = {
+            "context": {"client": {"clientName": "WEB", "clientVersion": "2.20240101.00.00", "hl": "en", "gl": "US"}},
+            "videoId": video_id,
+        }
+        with self._lock:
+            self.requests += 1
+        try:
+            data = self.transport.post(self.player_url, params={"prettyPrint": "false"}, json=payload).json()
+        except (requests.RequestException, ValueError):
+            return None
+        details = data.get("videoDetails", {})
+        microformat = data.get("microformat", {}).get("playerMicroformatRenderer", {})
+        if not details:
+            return None
+        with self._lock:
+            self.fetched += 1
+        duration = details.get("lengthSeconds")
+        views = details.get("viewCount")
+        return (
+            int(duration) if duration else None,
+            parse_iso_date(microformat.get("publishDate")),
+            int(views) if views else None,
+        )
+
+    def stats(self):
+        return {
+            "candidates": self.candidates,
+            "cache_hits": self.cache_hits,
+            "fetched": self.fetched,
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+        }
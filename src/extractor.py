@@ -0,0 +1,65 @@
+"""Extraction rapide de ytInitialData depuis le HTML brut (sans construire de DOM)"""
+
+import json
+
+# Formes connues de l'affectation dans les pages YouTube
+INITIAL_DATA_MARKERS = (
+    'var ytInitialData',
+    'window["ytInitialData"]',
+    "window['ytInitialData']",
+)
+
+_decoder = json.JSONDecoder()
+
+
+def find_json_object(text, marker, start=0):
+    """
+    Décode l'objet JSON affecté juste après `marker` dans `text`.
+
+    Seul l'objet est décodé (raw_decode s'arrête à l'accolade fermante
+    correspondante), le reste de la page n'est jamais analysé.
+
+    Returns:
+        dict|None: L'objet décodé, ou None si absent ou invalide
+    """
+    marker_end = text.find(marker, start)
+    if marker_end == -1:
+        return None
+    marker_end += len(marker)
+
+    # Seuls le signe égal et des espaces peuvent précéder l'accolade ouvrante
+    index = text.find('{', marker_end)
+    if index == -1 or text[marker_end:index].strip() != '=':
+        return None
+
+    try:
+        obj, _ = _decoder.raw_decode(text, index)
+    except json.JSONDecodeError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def extract_initial_data(page):
+    """
+    Trouve et décode ytInitialData dans le corps brut d'une page.
+
+    Args:
+        page (str|bytes): Corps de la réponse HTTP
+
+    Returns:
+        dict|None: ytInitialData, ou None si introuvable
+    """
+    if not page:
+        return None
+    if isinstance(page, (bytes, bytearray)):
+        # Ne décoder que la partie utile de la page
+        index = page.find(b'ytInitialData')
+        if index == -1:
+            return None
+        page = page[max(0, index - 16):].decode('utf-8', errors='replace')
+
+    for marker in INITIAL_DATA_MARKERS:
+        data = find_json_object(page, marker)
+        if data is not None:
+            return data
+    return None
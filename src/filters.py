@@ -0,0 +1,145 @@
+"""Compilation des filtres de crawl en un prédicat rapide"""
+
+from datetime import datetime
+
+
+def _to_timestamp(value):
+    """Convertit une date ISO (ou un nombre) en timestamp epoch"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class CompiledFilters:
+    """
+    Prédicat compilé une fois par crawl à partir du dict de filtres.
+
+    Les bornes de date sont converties en timestamps au départ et les vidéos
+    portent un `publishedTimestamp` numérique : l'évaluation ne fait plus que
+    des comparaisons de nombres. Les tests sont réordonnés au fil de l'eau
+    pour appliquer en premier ceux qui rejettent le plus de candidats.
+
+    Un champ manquant n'est jamais rejeté : sans complément des métadonnées
+    (MetadataEnricher), une vidéo sans durée passe un filtre `duration.min`.
+    """
+
+    # Champ de la vidéo testé pour chaque clé de filtre
+    FIELDS = {
+        "views": "views",
+        "duration": "duration",
+        "publishedTime": "publishedTimestamp",
+    }
+    REORDER_EVERY = 256
+
+    def __init__(self, filters=None):
+        self.filters = filters or {}
+        self._checks = []  # [champ, min, max, rejets]
+        # Ordre initial : vues puis durée (les plus sélectifs en pratique), puis date
+        for key in ("views", "duration", "publishedTime"):
+            bounds = self.filters.get(key)
+            if not bounds:
+                continue
+            if key == "publishedTime":
+                low, high = _to_timestamp(bounds.get('min')), _to_timestamp(bounds.get('max'))
+            else:
+                low, high = bounds.get('min'), bounds.get('max')
+            self._checks.append([self.FIELDS[key], low, high, 0])
+        self.evaluated = 0
+
+    def __bool__(self):
+        return bool(self._checks)
+
+    def __call__(self, video):
+        """Retourne True si la vidéo passe tous les filtres"""
+        self.evaluated += 1
+        if self.evaluated % self.REORDER_EVERY == 0:
+            self._checks.sort(key=lambda check: -check[3])
+        for check in self._checks:
+            value = video.get(check[0])
+            # Une valeur manquante n'est pas filtrée (comme une date non reconnue)
+            if value is None:
+                continue
+            if (check[1] is not None and value < check[1]) or (check[2] is not None and value > check[2]):
+                check[3] += 1
+                return False
+        return True
+
+    def batch(self, videos):
+        """
+        Évalue une page entière de candidats.
+
+        Chaque test est appliqué à tous les survivants du test précédent, si
+        bien que les tests suivants ne voient que les candidats restants.
+
+        Returns:
+            list: Un booléen par vidéo, dans l'ordre
+        """
+        self.evaluated += len(videos)
+        survivors = list(range(len(videos)))
+        for check in self._checks:
+            field, low, high = check[0], check[1], check[2]
+            remaining = []
+            for index in survivors:
+                value = videos[index].get(field)
+                if value is None or ((low is None or value >= low) and (high is None or value <= high)):
+                    remaining.append(index)
+            check[3] += len(survivors) - len(remaining)
+            survivors = remaining
+            if not survivors:
+                break
+        self._checks.sort(key=lambda check: -check[3])
+
+        result = [False] * len(videos)
+        for index in survivors:
+            result[index] = True
+        return result
+
+    def bounds(self, field):
+        """Bornes (min, max) testées sur un champ de la vidéo, None s'il n'est pas filtré"""
+        for check in self._checks:
+            if check[0] == field:
+                return check[1], check[2]
+        return None
+
+    def accepts(self, video, skip=()):
+        """
+        Vrai si aucun test ne rejette la vidéo sur ses champs connus, sans compter de rejet.
+
+        Args:
+            skip (tuple): Champs à ne pas tester (valeur encore approximative)
+        """
+        for field, low, high, _ in self._checks:
+            value = video.get(field)
+            if value is None or field in skip:
+                continue
+            if (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
+
+    def fit(self, video):
+        """Part des critères satisfaits par la vidéo (entre 0 et 1), sans compter de rejet"""
+        passed = total = 0
+        for field, low, high, _ in self._checks:
+            value = video.get(field)
+            if value is None:
+                continue
+            total += 1
+            passed += (low is None or value >= low) and (high is None or value <= high)
+        return passed / total if total else 0.0
+
+    def stats(self):
+        return {
+            "evaluated": self.evaluated,
+            "rejections": {check[0]: check[3] for check in self._checks},
+        }
+
+
+def compile_filters(filters):
+    """Compile un dict de filtres (un prédicat déjà compilé est retourné tel quel)"""
+    if isinstance(filters, CompiledFilters):
+        return filters
+    return CompiledFilters(filters)
@@ -0,0 +1,163 @@
+"""Enregistrement et rejeu des échanges HTTP d'un crawl (corpus de benchmark)"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_VERSION = 1
+
+
+def request_key(method, url, body=None):
+    """
+    Clé d'un échange enregistré : méthode et URL, plus une empreinte du corps
+    pour les POST (les continuations innertube partagent la même URL).
+    """
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += " " + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+class FixtureArchive:
+    """
+    Archive des réponses HTTP (statut, type de contenu, corps) indexées par
+    request_key, stockée en JSON compressé (gzip) comme les points de reprise.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, response):
+        with self._lock:
+            self.responses[key] = {
+                "url": response.url,
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type", ""),
+                "body": response.content.decode("utf-8", errors="replace"),
+            }
+
+    def get(self, key):
+        return self.responses.get(key)
+
+    def __len__(self):
+        return len(self.responses)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            state = {"version": FIXTURE_VERSION, "saved_at": time.time(), "responses": self.responses}
+            tmp_path = self.path + ".tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Lit une archive enregistrée.
+
+        Raises:
+            ValueError: Si l'archive est d'une autre version
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"Version d'archive non prise en charge: {state.get('version')}")
+        archive = cls(path)
+        archive.responses = state["responses"]
+        return archive
+
+
+class RecordingAdapter(BaseAdapter):
+    """Adaptateur requests qui transmet les requêtes et enregistre les réponses"""
+
+    def __init__(self, archive, adapter):
+        super().__init__()
+        self.archive = archive
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        response = self.adapter.send(request, **kwargs)
+        self.archive.record(request_key(request.method, request.url, request.body), response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adaptateur requests qui sert les réponses d'une archive sans accès réseau.
+
+    Une requête absente de l'archive échoue comme une erreur réseau (la page
+    est alors perdue pour le crawl), ce qui borne le crawl au corpus enregistré.
+    """
+
+    def __init__(self, archive, latency=0.0):
+        """
+        Args:
+            archive (FixtureArchive): Réponses enregistrées
+            latency (float): Délai simulé par requête (secondes), pour mesurer la concurrence
+        """
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        entry = self.archive.get(request_key(request.method, request.url, request.body))
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            raise requests.ConnectionError(f"Absent de l'archive: {request.method} {request.url}", request=request)
+        if self.latency:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict({"Content-Type": entry["content_type"]})
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def close(self):
+        pass
+
+
+def install_recorder(transport, archive):
+    """Enregistre dans `archive` toutes les réponses reçues par la session du transport"""
+    for prefix in ("https://", "http://"):
+        transport.session.mount(prefix, RecordingAdapter(archive, transport.session.get_adapter(prefix)))
+
+
+def install_replay(transport, archive, latency=0.0):
+    """
+    Remplace l'accès réseau du transport par le rejeu de `archive`.
+
+    Returns:
+        ReplayAdapter: L'adaptateur installé (compteurs hits/misses)
+    """
+    adapter = ReplayAdapter(archive, latency)
+    for prefix in ("https://", "http://"):
+        transport.session.mount(prefix, adapter)
+    return adapter
@@ -0,0 +1,249 @@
+"""File d'exploration (frontière) partagée par les méthodes de crawl"""
+
+import heapq
+import itertools
+import math
+from collections import deque
+from src.filters import compile_filters
+
+
+class Frontier:
+    """
+    File FIFO des vidéos restant à explorer.
+
+    Chaque vidéo n'y entre qu'une fois (la déduplication est faite en amont
+    par l'ensemble des vidéos vues) et en sort dès qu'elle est explorée :
+    push/pop sont en O(1) et la mémoire est bornée par la taille de la file.
+    """
+
+    kind = "fifo"
+
+    def __init__(self):
+        self._queue = deque()
+        self.pushed = 0
+        self.popped = 0
+        self.max_size = 0
+        self.max_depth = 0
+
+    def push(self, video, depth=0, parent_matched=False, matched=False):
+        """
+        Ajoute une vidéo découverte à `depth` sauts de la recherche initiale.
+
+        Args:
+            video (VideoRecord): Vidéo découverte
+            depth (int): Profondeur dans le graphe de recommandations
+            parent_matched (bool): La vidéo d'origine correspondait aux filtres
+            matched (bool): La vidéo elle-même correspond aux filtres
+        """
+        self._queue.append((video, depth, matched))
+        self._count_push(depth)
+
+    def pop(self):
+        """
+        Retire la prochaine vidéo à explorer.
+
+        Returns:
+            tuple: (vidéo, profondeur, correspond aux filtres)
+        """
+        item = self._queue.popleft()
+        self.popped += 1
+        return item
+
+    def record_expansion(self, video, matches):
+        """Retour d'information après exploration d'une vidéo (ignoré en FIFO)"""
+        pass
+
+    def done(self, video):
+        """Abandon d'une vidéo sortie de la file (déjà retirée en local ; voir SharedFrontier)"""
+        pass
+
+    def close(self):
+        """Fin du crawl : rien à libérer pour une frontière locale"""
+        pass
+
+    def wait(self):
+        """
+        Vrai s'il reste des entrées à explorer, en attendant au besoin celles
+        d'autres processus (bloquant pour une SharedFrontier ; bool(frontier)
+        ne bloque jamais).
+        """
+        return bool(self)
+
+    def entries(self):
+        """Entrées en file, au format (vidéo, profondeur, correspond, parente correspond)"""
+        return [(video, depth, matched, False) for video, depth, matched in self._queue]
+
+    def restore(self, video, depth=0, parent_matched=False, matched=False):
+        """Remet en file une entrée sauvegardée, sans la compter comme nouvelle découverte"""
+        self._queue.append((video, depth, matched))
+
+    def to_state(self, pending=()):
+        """
+        Sérialise la frontière pour un point de reprise.
+
+        Args:
+            pending (iterable): Entrées sorties de la file mais pas encore explorées
+        """
+        entries = [list(entry) for entry in self.entries()]
+        entries.extend([video, depth, matched, False] for video, depth, matched in pending)
+        return {"kind": self.kind, "entries": entries, "stats": self.stats()}
+
+    def load_state(self, state):
+        """Recharge les entrées et compteurs d'un état produit par to_state"""
+        for video, depth, matched, parent_matched in state.get("entries", []):
+            self.restore(video, depth, parent_matched=parent_matched, matched=matched)
+        stats = state.get("stats", {})
+        self.pushed = stats.get("pushed", len(self))
+        self.popped = stats.get("explored", 0)
+        self.max_size = max(stats.get("max_size", 0), len(self))
+        self.max_depth = stats.get("max_depth", 0)
+
+    def _count_push(self, depth):
+        self.pushed += 1
+        if len(self) > self.max_size:
+            self.max_size = len(self)
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __bool__(self):
+        return bool(self._queue)
+
+    def stats(self):
+        return {
+            "size": len(self),
+            "pushed": self.pushed,
+            "explored": self.popped,
+            "max_size": self.max_size,
+            "max_depth": self.max_depth,
+        }
+
+
+class PriorityFrontier(Frontier):
+    """
+    Frontière « best-first » : explore d'abord les vidéos dont les voisines
+    ont le plus de chances de passer les filtres.
+
+    Le score combine le rendement appris en ligne de la chaîne (part des
+    vidéos de la chaîne qui correspondent, et des correspondances trouvées en
+    explorant ses vidéos), le fait que la vidéo ou sa parente corresponde,
+    l'adéquation des métadonnées aux filtres et la profondeur. Les scores
+    périmés sont réévalués paresseusement au moment du pop.
+    """
+
+    CHANNEL_WEIGHT = 2.0
+    MATCHED_BONUS = 1.5
+    PARENT_MATCHED_BONUS = 1.0
+    FIT_WEIGHT = 0.5
+    VIEWS_WEIGHT = 0.3
+    DEPTH_PENALTY = 0.05
+
+    kind = "best_first"
+
+    def __init__(self, filters=None):
+        super().__init__()
+        self.filters = compile_filters(filters)
+        self._heap = []
+        self._counter = itertools.count()  # Départage FIFO à score égal
+        self._channel_hits = {}  # chaîne -> [vidéos correspondantes, vidéos vues]
+        self._channel_expansions = {}  # chaîne -> [correspondances trouvées, explorations]
+
+    def push(self, video, depth=0, parent_matched=False, matched=False):
+        channel_id = video.get('channelId') or ''
+        stats = self._channel_hits.setdefault(channel_id, [0, 0])
+        stats[0] += int(matched)
+        stats[1] += 1
+
+        self.restore(video, depth, parent_matched=parent_matched, matched=matched)
+        self._count_push(depth)
+
+    def restore(self, video, depth=0, parent_matched=False, matched=False):
+        entry = [video, depth, matched, parent_matched]
+        score = self.score(video, depth, parent_matched, matched)
+        heapq.heappush(self._heap, (-score, next(self._counter), entry))
+
+    def pop(self):
+        while True:
+            neg_score, order, entry = heapq.heappop(self._heap)
+            video, depth, matched, parent_matched = entry
+            score = self.score(video, depth, parent_matched, matched)
+            # Rendement de la chaîne revu à la baisse : replacer l'entrée dans le tas
+            if self._heap and score < -self._heap[0][0] - 1e-9:
+                heapq.heappush(self._heap, (-score, order, entry))
+                continue
+            self.popped += 1
+            return video, depth, matched
+
+    def record_expansion(self, video, matches):
+        stats = self._channel_expansions.setdefault(video.get('channelId') or '', [0, 0])
+        stats[0] += matches
+        stats[1] += 1
+
+    def entries(self):
+        return [tuple(entry) for _, _, entry in sorted(self._heap)]
+
+    def to_state(self, pending=()):
+        state = super().to_state(pending)
+        state["channel_hits"] = self._channel_hits
+        state["channel_expansions"] = self._channel_expansions
+        return state
+
+    def load_state(self, state):
+        # Les rendements par chaîne doivent être connus avant de recalculer les scores
+        self._channel_hits.update(state.get("channel_hits", {}))
+        self._channel_expansions.update(state.get("channel_expansions", {}))
+        super().load_state(state)
+
+    def channel_yield(self, channel_id):
+        """Taux de rendement lissé (a priori de Laplace) d'une chaîne"""
+        hits, seen = self._channel_hits.get(channel_id, (0, 0))
+        found, expansions = self._channel_expansions.get(channel_id, (0, 0))
+        discovery_rate = (hits + 1) / (seen + 2)
+        # Nombre moyen de correspondances par exploration, ramené dans [0, 1]
+        expansion_rate = (found + 1) / (found + expansions + 2)
+        return (discovery_rate + expansion_rate) / 2
+
+    def score(self, video, depth, parent_matched=False, matched=False):
+        score = self.CHANNEL_WEIGHT * self.channel_yield(video.get('channelId') or '')
+        if matched:
+            score += self.MATCHED_BONUS
+        if parent_matched:
+            score += self.PARENT_MATCHED_BONUS
+        score += self.FIT_WEIGHT * self.filters.fit(video)
+        views = video.get('views') or 0
+        if views > 0:
+            score += self.VIEWS_WEIGHT * min(math.log10(views) / 9, 1.0)
+        return score - self.DEPTH_PENALTY * depth
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def stats(self):
+        stats = super().stats()
+        stats["channels"] = len(self._channel_hits)
+        return stats
+
+
+def make_frontier(frontier=None, filters=None):
+    """
+    Construit la frontière demandée.
+
+    Args:
+        frontier (str|Frontier|None): "fifo" (défaut), "best_first" ou une instance
+        filters (dict|CompiledFilters): Filtres du crawl, utilisés par la frontière best-first
+
+    Returns:
+        Frontier: La frontière à utiliser
+    """
+    if isinstance(frontier, Frontier):
+        return frontier
+    if frontier in (None, "fifo"):
+        return Frontier()
+    if frontier == "best_first":
+        return PriorityFrontier(filters)
+    raise ValueError(f"Frontière inconnue: {frontier}")
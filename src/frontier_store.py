@@ -0,0 +1,416 @@
+"""Frontière et ensemble de vidéos vues partagés entre plusieurs processus de crawl"""
+
+from abc import ABC, abstractmethod
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from src.frontier import Frontier, PriorityFrontier
+from src.video import VideoRecord, video_to_json
+
+# États d'une entrée de la frontière partagée
+QUEUED, LEASED, DONE = 0, 1, 2
+
+
+class FrontierStore(ABC):
+    """
+    Interface d'un stockage partagé de frontière, pour un ou plusieurs crawls
+    identifiés par `job` (en général la requête de recherche).
+
+    Une entrée est réservée (bail) par un seul processus à la fois ; un bail
+    expiré (processus mort) la rend de nouveau disponible. L'ensemble des
+    vues est global au job : une vidéo n'est mise en file qu'une fois.
+
+    SQLiteFrontierStore convient à plusieurs processus d'un même hôte ; un
+    stockage réseau (Redis, base SQL partagée...) implémente les mêmes méthodes.
+    """
+
+    @abstractmethod
+    def add_seen(self, job, video_ids):
+        """
+        Ajoute des identifiants à l'ensemble des vues, atomiquement.
+
+        Returns:
+            set: Les identifiants qui n'avaient encore jamais été vus
+        """
+
+    @abstractmethod
+    def is_seen(self, job, video_id):
+        pass
+
+    @abstractmethod
+    def count_seen(self, job):
+        pass
+
+    @abstractmethod
+    def push(self, job, entries):
+        """
+        Met en file des entrées (vidéo, profondeur, correspond, priorité) ;
+        une vidéo déjà présente dans la frontière du job est ignorée.
+        """
+
+    @abstractmethod
+    def claim(self, job, worker_id, count=1, lease=120.0):
+        """
+        Réserve les entrées disponibles les plus prioritaires.
+
+        Returns:
+            list: Entrées (id, vidéo, profondeur, correspond) réservées pour `lease` secondes
+        """
+
+    @abstractmethod
+    def complete(self, job, worker_id, item_ids):
+        """Marque des entrées réservées comme explorées"""
+
+    @abstractmethod
+    def release(self, job, worker_id, item_ids):
+        """Rend des entrées réservées à la file (page perdue, arrêt du processus)"""
+
+    @abstractmethod
+    def counts(self, job, worker_id=None):
+        """
+        Returns:
+            dict: Entrées en file, réservées (dont par d'autres processus) et explorées
+        """
+
+    def close(self):
+        pass
+
+
+class SQLiteFrontierStore(FrontierStore):
+    """
+    Stockage SQLite (mode WAL) partagé par les processus d'un même hôte.
+
+    Les réservations se font dans une transaction BEGIN IMMEDIATE : deux
+    processus ne peuvent pas réserver la même entrée.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS frontier (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            video TEXT NOT NULL,
+            depth INTEGER NOT NULL,
+            matched INTEGER NOT NULL,
+            priority REAL NOT NULL DEFAULT 0,
+            state INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            lease_until REAL,
+            UNIQUE (job, video_id)
+        );
+        CREATE INDEX IF NOT EXISTS frontier_claim ON frontier (job, state, priority DESC, id);
+        CREATE TABLE IF NOT EXISTS seen (
+            job TEXT NOT NULL,
+            video_id TEXT NOT NULL,
+            PRIMARY KEY (job, video_id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path="src/media/frontier.db", timeout=30.0):
+        """
+        Args:
+            path (str): Fichier de la base (créé si absent)
+            timeout (float): Attente maximale d'un verrou d'écriture (secondes)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _transaction(self, work):
+        """Exécute `work(cursor)` dans une transaction d'écriture et retourne son résultat"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(cursor)
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            return result
+
+    def add_seen(self, job, video_ids):
+        def work(cursor):
+            new_ids = set()
+            for video_id in video_ids:
+                cursor.execute("INSERT OR IGNORE INTO seen (job, video_id) VALUES (?, ?)", (job, video_id))
+                if cursor.rowcount:
+                    new_ids.add(video_id)
+            return new_ids
+        return self._transaction(work)
+
+    def is_seen(self, job, video_id):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen WHERE job = ? AND video_id = ?", (job, video_id)).fetchone()
+        return row is not None
+
+    def count_seen(self, job):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen WHERE job = ?", (job,)).fetchone()[0]
+
+    def push(self, job, entries):
+        rows = [
+            (job, video["videoId"], json.dumps(video, separators=(",", ":"), default=video_to_json),
+             depth, int(matched), priority)
+            for video, depth, matched, priority in entries
+        ]
+        self._transaction(lambda cursor: cursor.executemany(
+            "INSERT OR IGNORE INTO frontier (job, video_id, video, depth, matched, priority) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        ))
+
+    def claim(self, job, worker_id, count=1, lease=120.0):
+        def work(cursor):
+            now = time.time()
+            rows = cursor.execute(
+                "SELECT id, video, depth, matched FROM frontier "
+                "WHERE job = ? AND (state = ? OR (state = ? AND lease_until < ?)) "
+                "ORDER BY priority DESC, id LIMIT ?",
+                (job, QUEUED, LEASED, now, count),
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE frontier SET state = ?, owner = ?, lease_until = ? WHERE id = ?",
+                [(LEASED, worker_id, now + lease, row[0]) for row in rows],
+            )
+            return rows
+        return [
+            (item_id, VideoRecord.from_dict(json.loads(video)), depth, bool(matched))
+            for item_id, video, depth, matched in self._transaction(work)
+        ]
+
+    def complete(self, job, worker_id, item_ids):
+        self._transaction(lambda cursor: cursor.executemany(
+            "UPDATE frontier SET state = ?, lease_until = NULL WHERE id = ? AND owner = ?",
+            [(DONE, item_id, worker_id) for item_id in item_ids],
+        ))
+
+    def release(self, job, worker_id, item_ids):
+        self._transaction(lambda cursor: cursor.executemany(
+            "UPDATE frontier SET state = ?, owner = NULL, lease_until = NULL WHERE id = ? AND owner = ? AND state = ?",
+            [(QUEUED, item_id, worker_id, LEASED) for item_id in item_ids],
+        ))
+
+    def counts(self, job, worker_id=None):
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*), SUM(state = ? AND lease_until >= ? AND owner IS NOT ?) "
+                "FROM frontier WHERE job = ? GROUP BY state",
+                (LEASED, now, worker_id, job),
+            ).fetchall()
+        counts = {"queued": 0, "leased": 0, "leased_by_others": 0, "done": 0}
+        for state, count, by_others in rows:
+            if state == QUEUED:
+                counts["queued"] = count
+            elif state == LEASED:
+                counts["leased"] = count
+                counts["leased_by_others"] = by_others or 0
+            else:
+                counts["done"] = count
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SharedSeenSet:
+    """Ensemble des vidéos vues d'un job, stocké dans un FrontierStore"""
+
+    kind = "shared"
+
+    def __init__(self, store, job):
+        self.store = store
+        self.job = job
+
+    def add_new(self, video_ids):
+        """Ajoute atomiquement et retourne les identifiants jamais vus (par aucun processus)"""
+        return self.store.add_seen(self.job, video_ids)
+
+    def add(self, video_id):
+        self.store.add_seen(self.job, [video_id])
+
+    def update(self, video_ids):
+        self.store.add_seen(self.job, list(video_ids))
+
+    def __contains__(self, video_id):
+        return self.store.is_seen(self.job, video_id)
+
+    def __len__(self):
+        return self.store.count_seen(self.job)
+
+    def memory_usage(self):
+        return 0
+
+    def to_state(self):
+        # L'état vit dans le stockage partagé : rien à écrire dans le point de reprise
+        return {"kind": self.kind}
+
+    def load_state(self, state):
+        pass
+
+
+class SharedFrontier(Frontier):
+    """
+    Frontière adossée à un FrontierStore : plusieurs processus (ou hôtes)
+    crawlent la même requête sans jamais télécharger deux fois la même page.
+
+    pop() sert des entrées réservées par bail ; une entrée est marquée
+    explorée après record_expansion() (ou done() si la page est abandonnée)
+    et rendue à la file par restore() quand la page a été perdue.
+    """
+
+    kind = "shared"
+
+    def __init__(self, store, job, ordering="fifo", worker_id=None, lease=120.0, batch=4,
+                 idle_timeout=10.0, poll_interval=0.5):
+        """
+        Args:
+            store (FrontierStore): Stockage partagé
+            job (str): Identifiant du crawl commun (ex. la requête)
+            ordering (str): "fifo" ou "best_first" (priorité statique : correspondance,
+                correspondance de la parente et profondeur, pondérées comme PriorityFrontier)
+            worker_id (str): Identifiant du processus (défaut : hôte, pid et suffixe aléatoire)
+            lease (float): Durée d'un bail (secondes) avant qu'une entrée soit reprise
+            batch (int): Entrées réservées par aller-retour vers le stockage
+            idle_timeout (float): Attente maximale de nouvelles entrées quand la file est vide
+            poll_interval (float): Intervalle d'interrogation pendant cette attente
+        """
+        super().__init__()
+        if ordering not in ("fifo", "best_first"):
+            raise ValueError(f"Ordre inconnu: {ordering}")
+        self.store = store
+        self.job = job
+        self.ordering = ordering
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease = lease
+        self.batch = batch
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self._outbox = []  # Entrées poussées pas encore écrites dans le stockage
+        self._claimed = []  # Entrées réservées pas encore servies par pop()
+        self._leases = {}  # Identifiant vidéo -> identifiant d'entrée réservée
+
+    def seen_set(self):
+        """Ensemble des vues partagé du même job"""
+        return SharedSeenSet(self.store, self.job)
+
+    def _priority(self, depth, parent_matched, matched):
+        if self.ordering == "fifo":
+            return 0.0
+        return (PriorityFrontier.MATCHED_BONUS * matched + PriorityFrontier.PARENT_MATCHED_BONUS * parent_matched
+                - PriorityFrontier.DEPTH_PENALTY * depth)
+
+    def push(self, video, depth=0, parent_matched=False, matched=False):
+        self._outbox.append((video, depth, matched, self._priority(depth, parent_matched, matched)))
+        self.pushed += 1
+        self.max_depth = max(self.max_depth, depth)
+        if len(self._outbox) >= 50:
+            self._flush()
+
+    def _flush(self):
+        if self._outbox:
+            self.store.push(self.job, self._outbox)
+            self._outbox = []
+
+    def _claim(self, wait=True):
+        """
+        Réserve de nouvelles entrées.
+
+        Args:
+            wait (bool): Attendre (time.sleep) celles des autres processus si la file est
+                vide ; sinon une seule tentative, sans attente
+        """
+        self._flush()
+        deadline = time.monotonic() + self.idle_timeout
+        while True:
+            claimed = self.store.claim(self.job, self.worker_id, self.batch, self.lease)
+            if claimed:
+                self._claimed.extend(claimed)
+                return True
+            if not wait:
+                return False
+            # Nos propres pages en cours peuvent encore alimenter la file : ne pas bloquer
+            if self._leases:
+                return False
+            counts = self.store.counts(self.job, self.worker_id)
+            # Personne d'autre ne travaille : attendre seulement le délai d'inactivité
+            # (un autre processus peut être encore en train de faire sa recherche initiale)
+            if not counts["leased_by_others"] and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def pop(self):
+        if not self._claimed and not self._claim():
+            raise IndexError("pop from an empty frontier")
+        item_id, video, depth, matched = self._claimed.pop(0)
+        self._leases[video["videoId"]] = item_id
+        self.popped += 1
+        return video, depth, matched
+
+    def record_expansion(self, video, matches):
+        self.done(video)
+
+    def done(self, video):
+        item_id = self._leases.pop(video["videoId"], None)
+        if item_id is not None:
+            self._flush()
+            self.store.complete(self.job, self.worker_id, [item_id])
+
+    def restore(self, video, depth=0, parent_matched=False, matched=False):
+        item_id = self._leases.pop(video["videoId"], None)
+        if item_id is not None:
+            self.store.release(self.job, self.worker_id, [item_id])
+        else:
+            self._outbox.append((video, depth, matched, self._priority(depth, parent_matched, matched)))
+
+    def close(self):
+        """Rend au stockage les entrées réservées non explorées (fin ou arrêt du crawl)"""
+        self._flush()
+        item_ids = [item[0] for item in self._claimed] + list(self._leases.values())
+        if item_ids:
+            self.store.release(self.job, self.worker_id, item_ids)
+        self._claimed = []
+        self._leases = {}
+
+    def entries(self):
+        return []
+
+    def to_state(self, pending=()):
+        # La frontière vit dans le stockage partagé : rien à écrire dans le point de reprise
+        self._flush()
+        return {"kind": self.kind, "entries": [], "stats": self.stats()}
+
+    def load_state(self, state):
+        pass
+
+    def __len__(self):
+        return len(self._claimed) + len(self._outbox) + self.store.counts(self.job)["queued"]
+
+    def __bool__(self):
+        # Jamais bloquant : évalué sur le thread de la boucle d'événements d'astream_crawl
+        return bool(self._claimed) or self._claim(wait=False)
+
+    def wait(self):
+        return bool(self._claimed) or self._claim()
+
+    def stats(self):
+        counts = self.store.counts(self.job, self.worker_id)
+        return {
+            "size": counts["queued"] + len(self._claimed) + len(self._outbox),
+            "pushed": self.pushed,
+            "explored": self.popped,
+            "max_size": max(self.max_size, counts["queued"]),
+            "max_depth": self.max_depth,
+            "shared": counts,
+        }
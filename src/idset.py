@@ -0,0 +1,287 @@
+"""Ensembles compacts d'identifiants vidéo pour les très longs crawls"""
+
+import base64
+import hashlib
+import math
+import sys
+from array import array
+
+# Alphabet base64url des identifiants YouTube (11 caractères, 64 bits utiles)
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+_CHAR_VALUES = {c: i for i, c in enumerate(ALPHABET)}
+
+_EMPTY = 0
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def encode_video_id(video_id):
+    """
+    Encode un identifiant vidéo sur un entier de 64 bits.
+
+    Les 10 premiers caractères portent 6 bits chacun, le dernier seulement 4
+    (ses 2 bits de poids faible sont toujours nuls pour un identifiant valide).
+
+    Returns:
+        int|None: L'entier, ou None si l'identifiant n'a pas cette forme
+    """
+    if not isinstance(video_id, str) or len(video_id) != 11:
+        return None
+    value = 0
+    try:
+        for char in video_id[:10]:
+            value = (value << 6) | _CHAR_VALUES[char]
+        last = _CHAR_VALUES[video_id[10]]
+    except KeyError:
+        return None
+    if last & 3:
+        return None
+    return (value << 4) | (last >> 2)
+
+
+def decode_video_id(value):
+    """Opération inverse de encode_video_id"""
+    chars = [ALPHABET[(value & 0xF) << 2]]
+    value >>= 4
+    for _ in range(10):
+        chars.append(ALPHABET[value & 0x3F])
+        value >>= 6
+    return "".join(reversed(chars))
+
+
+class CompactIdSet:
+    """
+    Ensemble exact d'identifiants vidéo, stockés comme entiers de 64 bits dans
+    une table de hachage à adressage ouvert (array('Q'), sondage linéaire).
+
+    Environ 8 octets par alvéole au lieu d'une centaine par chaîne Python ;
+    les identifiants qui ne s'encodent pas sont gardés dans un set ordinaire.
+    """
+
+    kind = "compact"
+    MAX_LOAD = 0.6
+
+    def __init__(self, values=(), capacity=1024):
+        size = 1 << max(4, math.ceil(math.log2(max(capacity, 1) / self.MAX_LOAD)))
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+        self._has_zero = False  # L'entier 0 sert de marqueur d'alvéole vide
+        self._others = set()
+        for value in values:
+            self.add(value)
+
+    def _slot(self, packed):
+        index = ((packed * _HASH_MULTIPLIER) & _MASK64) >> 20 & self._mask
+        table = self._table
+        while True:
+            current = table[index]
+            if current == _EMPTY or current == packed:
+                return index
+            index = (index + 1) & self._mask
+
+    def add(self, video_id):
+        packed = encode_video_id(video_id)
+        if packed is None:
+            self._others.add(video_id)
+            return
+        if packed == _EMPTY:
+            self._has_zero = True
+            return
+        index = self._slot(packed)
+        if self._table[index] == _EMPTY:
+            self._table[index] = packed
+            self._count += 1
+            if self._count > self.MAX_LOAD * len(self._table):
+                self._grow()
+
+    def update(self, video_ids):
+        for video_id in video_ids:
+            self.add(video_id)
+
+    def _grow(self):
+        old_table = self._table
+        self._table = array("Q", bytes(8 * 2 * len(old_table)))
+        self._mask = len(self._table) - 1
+        for packed in old_table:
+            if packed != _EMPTY:
+                self._table[self._slot(packed)] = packed
+
+    def __contains__(self, video_id):
+        packed = encode_video_id(video_id)
+        if packed is None:
+            return video_id in self._others
+        if packed == _EMPTY:
+            return self._has_zero
+        return self._table[self._slot(packed)] == packed
+
+    def __len__(self):
+        return self._count + self._has_zero + len(self._others)
+
+    def __iter__(self):
+        if self._has_zero:
+            yield decode_video_id(0)
+        for packed in self._table:
+            if packed != _EMPTY:
+                yield decode_video_id(packed)
+        yield from self._others
+
+    def memory_usage(self):
+        """Mémoire occupée en octets (table et identifiants non encodables)"""
+        return (sys.getsizeof(self._table) + sys.getsizeof(self._others)
+                + sum(sys.getsizeof(video_id) for video_id in self._others))
+
+    def to_state(self):
+        """État sérialisable (entiers encodés en base64) pour les points de reprise"""
+        packed = array("Q", (value for value in self._table if value != _EMPTY))
+        if self._has_zero:
+            packed.append(_EMPTY)
+        return {
+            "kind": self.kind,
+            "packed": base64.b64encode(packed.tobytes()).decode("ascii"),
+            "others": list(self._others),
+        }
+
+    def load_state(self, state):
+        packed = array("Q")
+        packed.frombytes(base64.b64decode(state["packed"]))
+        for value in packed:
+            self.add(decode_video_id(value))
+        self.update(state.get("others", []))
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom extensible : une nouvelle couche deux fois plus grande
+    (et au taux d'erreur deux fois plus strict) est ajoutée quand la couche
+    courante est pleine, ce qui borne le taux global de faux positifs à
+    environ `error_rate`. Un faux positif fait ignorer une vidéo jamais vue.
+    """
+
+    kind = "bloom"
+
+    def __init__(self, values=(), capacity=100_000, error_rate=0.001):
+        self.initial_capacity = capacity
+        self.error_rate = error_rate
+        self._layers = []  # [bits, nombre de bits, nombre de hachages, capacité, éléments]
+        self._count = 0
+        self._add_layer()
+        for value in values:
+            self.add(value)
+
+    def _add_layer(self):
+        index = len(self._layers)
+        capacity = self.initial_capacity * (2 ** index)
+        error_rate = self.error_rate / (2 ** (index + 1))
+        num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._layers.append([bytearray((num_bits + 7) // 8), num_bits, num_hashes, capacity, 0])
+
+    @staticmethod
+    def _hashes(video_id):
+        digest = hashlib.blake2b(video_id.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    @staticmethod
+    def _positions(layer, h1, h2):
+        num_bits, num_hashes = layer[1], layer[2]
+        return ((h1 + i * h2) % num_bits for i in range(num_hashes))
+
+    def add(self, video_id):
+        h1, h2 = self._hashes(video_id)
+        if self._contains_hashes(h1, h2):
+            return
+        layer = self._layers[-1]
+        if layer[4] >= layer[3]:
+            self._add_layer()
+            layer = self._layers[-1]
+        bits = layer[0]
+        for position in self._positions(layer, h1, h2):
+            bits[position >> 3] |= 1 << (position & 7)
+        layer[4] += 1
+        self._count += 1
+
+    def update(self, video_ids):
+        for video_id in video_ids:
+            self.add(video_id)
+
+    def _contains_hashes(self, h1, h2):
+        for layer in self._layers:
+            bits = layer[0]
+            if all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(layer, h1, h2)):
+                return True
+        return False
+
+    def __contains__(self, video_id):
+        return self._contains_hashes(*self._hashes(video_id))
+
+    def __len__(self):
+        """Nombre (approximatif, faux positifs exclus à l'ajout) d'éléments ajoutés"""
+        return self._count
+
+    def memory_usage(self):
+        return sum(sys.getsizeof(layer[0]) for layer in self._layers)
+
+    def to_state(self):
+        return {
+            "kind": self.kind,
+            "count": self._count,
+            "layers": [
+                [base64.b64encode(bytes(bits)).decode("ascii"), num_bits, num_hashes, capacity, count]
+                for bits, num_bits, num_hashes, capacity, count in self._layers
+            ],
+        }
+
+    def load_state(self, state):
+        self._layers = [
+            [bytearray(base64.b64decode(bits)), num_bits, num_hashes, capacity, count]
+            for bits, num_bits, num_hashes, capacity, count in state["layers"]
+        ]
+        self._count = state["count"]
+
+
+def make_id_set(kind="set", values=(), error_rate=0.001):
+    """
+    Construit un ensemble d'identifiants vidéo.
+
+    Args:
+        kind (str): "set" (set Python), "compact" (exact, entiers 64 bits) ou "bloom" (probabiliste)
+        values (iterable): Identifiants initiaux
+        error_rate (float): Taux de faux positifs visé pour "bloom"
+    """
+    if kind == "set":
+        return set(values)
+    if kind == "compact":
+        return CompactIdSet(values)
+    if kind == "bloom":
+        return BloomFilter(values, error_rate=error_rate)
+    raise ValueError(f"Type d'ensemble inconnu: {kind}")
+
+
+def id_set_state(id_set):
+    """État sérialisable d'un ensemble construit par make_id_set"""
+    if hasattr(id_set, "to_state"):
+        return id_set.to_state()
+    return list(id_set)
+
+
+def load_id_set_state(id_set, state):
+    """Recharge dans `id_set` un état produit par id_set_state"""
+    if isinstance(state, list):
+        id_set.update(state)
+    elif getattr(id_set, "kind", None) == state.get("kind"):
+        id_set.load_state(state)
+    elif state.get("kind") == CompactIdSet.kind:
+        # Changement de type d'ensemble entre deux exécutions : repasser par les identifiants
+        restored = CompactIdSet()
+        restored.load_state(state)
+        id_set.update(restored)
+    else:
+        raise ValueError("Un filtre de Bloom ne peut être rechargé que dans un filtre de Bloom")
+
+
+def id_set_memory(id_set):
+    """Mémoire approximative (octets) occupée par un ensemble d'identifiants"""
+    if hasattr(id_set, "memory_usage"):
+        return id_set.memory_usage()
+    return sys.getsizeof(id_set) + sum(sys.getsizeof(video_id) for video_id in id_set)
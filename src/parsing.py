@@ -0,0 +1,117 @@
+"""Analyse des pages déportée dans un pool de processus"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+
+def _parse_in_worker(extract_fn, page):
+    """Décode ytInitialData et parcourt les renderers dans le processus de travail"""
+    started = time.perf_counter()
+    videos = extract_fn(page)
+    return videos, (time.perf_counter() - started) * 1000
+
+
+class ParseStats:
+    """Temps d'analyse par page (millisecondes)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remet les compteurs à zéro (début d'un crawl)"""
+        with self._lock:
+            self.pages = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+            self.timeouts = 0
+            self.errors = 0
+
+    def record(self, elapsed_ms):
+        with self._lock:
+            self.pages += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "avg_ms": self.total_ms / self.pages if self.pages else 0.0,
+                "max_ms": self.max_ms,
+                "total_ms": self.total_ms,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+            }
+
+
+class ParsePool:
+    """
+    Pool de processus qui analyse les corps de pages bruts hors du GIL du
+    processus de crawl, pendant que celui-ci continue à télécharger.
+
+    Les processus n'instancient aucun crawler : ils appellent une fonction
+    d'extraction sans état (importable au niveau module, donc picklable) et
+    retournent les vidéos extraites avec le temps d'analyse mesuré sur place.
+    """
+
+    def __init__(self, extract_fn, workers=None, timeout=30, stats=None):
+        """
+        Args:
+            extract_fn (callable): Fonction de niveau module page -> liste de vidéos
+            workers (int): Nombre de processus (défaut : nombre de cœurs)
+            timeout (float): Délai maximal d'analyse d'une page (secondes)
+            stats (ParseStats): Compteurs à alimenter (partagés avec l'analyse locale)
+        """
+        self.extract_fn = extract_fn
+        self.timeout = timeout
+        self.stats = stats if stats is not None else ParseStats()
+        # "spawn" : pas de fork d'un processus qui a déjà des threads réseau
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def submit(self, page):
+        """
+        Soumet une page à analyser.
+
+        Returns:
+            concurrent.futures.Future: Résultat (vidéos, temps d'analyse en ms)
+        """
+        return self.executor.submit(_parse_in_worker, self.extract_fn, page)
+
+    def result(self, future):
+        """Attend le résultat d'une analyse ; None si elle a échoué ou dépassé le délai"""
+        try:
+            videos, elapsed_ms = future.result(timeout=self.timeout)
+        except TimeoutError:
+            return self.timed_out(future)
+        except Exception:
+            self.stats.record_error()
+            return None
+        self.stats.record(elapsed_ms)
+        return videos
+
+    def timed_out(self, future):
+        """Abandonne une analyse qui a dépassé le délai (attente bloquante ou asyncio.wait_for)"""
+        future.cancel()
+        self.stats.record_timeout()
+        return None
+
+    def parse(self, page):
+        """Analyse une page de façon bloquante (le GIL est libéré pendant l'attente)"""
+        return self.result(self.submit(page))
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
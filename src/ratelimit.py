@@ -0,0 +1,114 @@
+"""Limitation de débit par hôte (seau à jetons) avec ajustement AIMD"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` requêtes par seconde en régime établi, rafales jusqu'à `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, now):
+        """
+        Réserve un jeton.
+
+        Returns:
+            float: Délai d'attente (secondes) avant de pouvoir envoyer la requête
+        """
+        self._refill(now)
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self.paused_until - now)
+
+
+class AdaptiveRateLimiter:
+    """
+    Limiteur de débit par hôte qui cherche le débit maximal soutenable.
+
+    Chaque succès augmente le débit de façon additive (d'environ
+    `increase` requêtes/s par seconde de fonctionnement), chaque réponse de
+    limitation (429, captcha...) le divise par `1 / decrease` et suspend
+    l'hôte pendant un délai exponentiel (ou le Retry-After du serveur).
+    """
+
+    def __init__(self, initial_rate=5.0, burst=10, min_rate=0.2, max_rate=50.0,
+                 increase=0.5, decrease=0.5, base_backoff=2.0, max_backoff=120.0):
+        self.initial_rate = initial_rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._consecutive_throttles = {}
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.initial_rate, self.burst)
+        return bucket
+
+    def acquire(self, host):
+        """Bloque jusqu'à ce qu'une requête vers `host` soit autorisée"""
+        with self._lock:
+            wait = self._bucket(host).reserve(time.monotonic())
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self, host):
+        with self._lock:
+            bucket = self._bucket(host)
+            # Augmentation additive répartie sur les requêtes d'une seconde
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase / max(bucket.rate, 1.0))
+            self._consecutive_throttles[host] = 0
+
+    def on_throttle(self, host, retry_after=None):
+        """
+        Signale une réponse de limitation : diminution multiplicative et pause de l'hôte.
+
+        Returns:
+            float: Durée de la pause appliquée (secondes)
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            count = self._consecutive_throttles.get(host, 0) + 1
+            self._consecutive_throttles[host] = count
+            backoff = retry_after if retry_after is not None else self.base_backoff * (2 ** (count - 1))
+            backoff = min(self.max_backoff, backoff)
+            now = time.monotonic()
+            bucket.paused_until = max(bucket.paused_until, now + backoff)
+            bucket.tokens = min(bucket.tokens, 0)
+            self.throttled += 1
+            return backoff
+
+    def current_rate(self, host=None):
+        """Débit courant (requêtes/s) d'un hôte, ou de tous les hôtes connus"""
+        with self._lock:
+            if host is not None:
+                bucket = self._buckets.get(host)
+                return bucket.rate if bucket else self.initial_rate
+            return {name: bucket.rate for name, bucket in self._buckets.items()}
+
+    def stats(self):
+        return {
+            "rates": self.current_rate(),
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited, 3),
+        }
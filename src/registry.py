@@ -0,0 +1,196 @@
+"""Registre des vidéos déjà uploadées (SQLite, ajout en O(1), relecture incrémentale, réservations)"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class UploadRegistry:
+    """
+    Registre persistant des vidéos source déjà uploadées et de leurs IDs YouTube.
+
+    Chaque upload est une ligne ajoutée (numéro de séquence croissant) ; les
+    index sur l'ID source et l'ID uploadé rendent les recherches directes,
+    et un lecteur ne relit que les lignes ajoutées depuis sa dernière lecture.
+    L'ancien fichier uploaded_videos.json est importé une seule fois.
+
+    Plusieurs processus peuvent partager le registre : une vidéo est
+    réservée (atomiquement, BEGIN IMMEDIATE) avant son téléchargement, et la
+    réservation expire après `ttl` secondes si son propriétaire disparaît.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS uploads (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT,
+            uploaded_id TEXT,
+            title TEXT,
+            uploaded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS uploads_video_id ON uploads (video_id);
+        CREATE INDEX IF NOT EXISTS uploads_uploaded_id ON uploads (uploaded_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS reservations (
+            video_id TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    # Durée de vie par défaut d'une réservation (téléchargement, édition et upload)
+    RESERVATION_TTL = 3600.0
+
+    def __init__(self, path="src/media/registry.db", legacy_json="src/media/uploaded_videos.json", timeout=30.0,
+                 owner=None):
+        """
+        Args:
+            path (str): Fichier de la base (créé si absent)
+            legacy_json (str): Ancien registre JSON à importer à la création (None pour ignorer)
+            timeout (float): Attente maximale d'un verrou d'écriture (secondes)
+            owner (str): Identifiant de ce processus pour les réservations (hôte, pid et suffixe aléatoire par défaut)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        if legacy_json:
+            self._migrate_json(legacy_json)
+
+    def _transaction(self, work):
+        """Exécute `work(cursor)` dans une transaction d'écriture et retourne son résultat"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(cursor)
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            return result
+
+    def _migrate_json(self, legacy_json):
+        """Importe uploaded_videos.json une seule fois (marqueur dans la table meta)"""
+        def work(cursor):
+            if cursor.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+                return
+            try:
+                with open(legacy_json, "r") as f:
+                    videos = json.load(f).get("videos", [])
+            except (FileNotFoundError, json.JSONDecodeError):
+                videos = []
+            now = time.time()
+            cursor.executemany(
+                "INSERT INTO uploads (video_id, uploaded_id, title, uploaded_at) VALUES (?, ?, NULL, ?)",
+                [(video.get("videoId") or None, video.get("uploadedId") or None, now) for video in videos],
+            )
+            cursor.execute("INSERT INTO meta VALUES ('migrated_json', ?)", (legacy_json,))
+        self._transaction(work)
+
+    def add(self, video_id, uploaded_id=None, title=None):
+        """
+        Enregistre un upload (et libère la réservation de la vidéo).
+
+        Returns:
+            int: Numéro de séquence de l'entrée
+        """
+        def work(cursor):
+            cursor.execute(
+                "INSERT INTO uploads (video_id, uploaded_id, title, uploaded_at) VALUES (?, ?, ?, ?)",
+                (video_id or None, uploaded_id or None, title, time.time()),
+            )
+            seq = cursor.lastrowid
+            cursor.execute("DELETE FROM reservations WHERE video_id = ?", (video_id,))
+            return seq
+        return self._transaction(work)
+
+    @staticmethod
+    def _is_uploaded(cursor, video_id):
+        row = cursor.execute(
+            "SELECT 1 FROM uploads WHERE video_id = ? UNION ALL SELECT 1 FROM uploads WHERE uploaded_id = ? LIMIT 1",
+            (video_id, video_id),
+        ).fetchone()
+        return row is not None
+
+    def __contains__(self, video_id):
+        """Vrai si l'ID est celui d'une vidéo source ou d'une vidéo uploadée"""
+        with self._lock:
+            return self._is_uploaded(self._conn.cursor(), video_id)
+
+    def reserve(self, video_id, ttl=None):
+        """
+        Réserve une vidéo pour ce processus avant son téléchargement.
+
+        Réserver à nouveau une vidéo déjà réservée par ce processus prolonge
+        la réservation ; une réservation expirée d'un autre processus est reprise.
+
+        Args:
+            video_id (str): Identifiant de la vidéo source
+            ttl (float): Durée de vie de la réservation (RESERVATION_TTL par défaut)
+
+        Returns:
+            bool: False si la vidéo est déjà uploadée ou réservée par un autre processus
+        """
+        ttl = self.RESERVATION_TTL if ttl is None else ttl
+
+        def work(cursor):
+            if self._is_uploaded(cursor, video_id):
+                return False
+            now = time.time()
+            row = cursor.execute("SELECT owner, expires_at FROM reservations WHERE video_id = ?", (video_id,)).fetchone()
+            if row and row[0] != self.owner and row[1] > now:
+                return False
+            cursor.execute("INSERT OR REPLACE INTO reservations VALUES (?, ?, ?)", (video_id, self.owner, now + ttl))
+            return True
+        return self._transaction(work)
+
+    def release(self, video_id):
+        """Libère la réservation d'une vidéo (échec du traitement), si ce processus la détient"""
+        self._transaction(lambda cursor: cursor.execute(
+            "DELETE FROM reservations WHERE video_id = ? AND owner = ?", (video_id, self.owner)
+        ))
+
+    def release_all(self):
+        """Libère toutes les réservations de ce processus (arrêt)"""
+        return self._transaction(lambda cursor: cursor.execute(
+            "DELETE FROM reservations WHERE owner = ?", (self.owner,)
+        ).rowcount)
+
+    def is_reserved(self, video_id):
+        """Vrai si la vidéo est réservée par un autre processus (réservation non expirée)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM reservations WHERE video_id = ? AND owner != ? AND expires_at > ?",
+                (video_id, self.owner, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def entries_since(self, seq=0):
+        """
+        Entrées ajoutées après le numéro de séquence `seq`.
+
+        Returns:
+            list: Tuples (seq, ID source, ID uploadé), dans l'ordre d'ajout
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, video_id, uploaded_id FROM uploads WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
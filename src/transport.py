@@ -0,0 +1,220 @@
+"""Couche de transport HTTP partagée par les crawlers"""
+
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Le décodage brotli n'est possible que si une des bibliothèques est installée
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+
+class TransportStats:
+    """Compteurs de requêtes et de connexions (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def incr(self, name, value=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def reused_connections(self):
+        """Nombre de requêtes servies par une connexion déjà ouverte"""
+        return max(0, self.requests - self.errors - self.new_connections)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "errors": self.errors,
+                "bytes_received": self.bytes_received,
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
+
+
+class ThrottledError(requests.RequestException):
+    """Le serveur limite encore les requêtes après toutes les tentatives"""
+
+
+# Cookie d'acceptation qui évite la page de consentement (consent.youtube.com)
+CONSENT_COOKIE = ("SOCS", "CAI", ".youtube.com")
+
+
+def is_throttled(response):
+    """Détecte une réponse de limitation de débit (429, 503, page captcha)"""
+    if response.status_code in (429, 503):
+        return True
+    if "google.com/sorry" in response.url:
+        return True
+    content = response.content
+    return response.status_code == 200 and b"ytInitialData" not in content and b"g-recaptcha" in content
+
+
+def is_consent_page(response):
+    return "consent." in urlparse(response.url).netloc
+
+
+def retry_after(response):
+    """Délai Retry-After du serveur en secondes, s'il est numérique"""
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter qui compte les nouvelles connexions TCP/TLS ouvertes"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        # urllib3 rouvre les sockets fermés sans recréer l'objet connexion :
+        # on compte donc les appels à connect() plutôt que les instanciations
+        class CountingHTTPConnection(HTTPConnection):
+            def connect(self):
+                stats.incr("new_connections")
+                return super().connect()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def connect(self):
+                stats.incr("new_connections")
+                return super().connect()
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = CountingHTTPConnection
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = CountingHTTPSConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class HttpTransport:
+    """
+    Session HTTP persistante (keep-alive) avec pool de connexions.
+
+    Les en-têtes sont construits une seule fois et partagés par toutes les
+    requêtes ; les connexions sont réutilisées entre les pages crawlées.
+    """
+
+    def __init__(self, headers=None, pool_size=10, timeout=(5, 20), rate_limiter=None, max_retries=3):
+        """
+        Args:
+            headers (dict): En-têtes par défaut de la session
+            pool_size (int): Nombre de connexions conservées par hôte
+            timeout (float|tuple): Timeout (connexion, lecture) par requête
+            rate_limiter (AdaptiveRateLimiter): Limiteur de débit par hôte (aucun si None)
+            max_retries (int): Nouvelles tentatives après une réponse de limitation
+        """
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.stats = TransportStats()
+
+        self.session = requests.Session()
+        adapter = _CountingAdapter(self.stats, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if headers:
+            self.session.headers.update(headers)
+        self.session.headers["Accept-Encoding"] = self.accept_encoding()
+
+    @staticmethod
+    def accept_encoding():
+        """Encodages de compression acceptés (brotli seulement si décodable)"""
+        return "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+    def get(self, url, timeout=None, **kwargs):
+        """
+        Effectue une requête GET via la session partagée.
+
+        Returns:
+            requests.Response: La réponse (lève une exception en cas d'erreur réseau)
+        """
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def post(self, url, timeout=None, **kwargs):
+        """Effectue une requête POST (ex. JSON innertube) via la session partagée"""
+        return self.request("POST", url, timeout=timeout, **kwargs)
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """
+        Envoie une requête en respectant le débit autorisé pour l'hôte.
+
+        Une réponse de limitation réduit le débit, suspend l'hôte puis la
+        requête est retentée ; une page de consentement est contournée une fois
+        avec le cookie d'acceptation.
+
+        Raises:
+            ThrottledError: Si l'hôte limite encore après max_retries tentatives
+        """
+        host = urlparse(url).netloc
+        consent_retried = False
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(host)
+            response = self._send(method, url, timeout, **kwargs)
+
+            if is_consent_page(response) and not consent_retried:
+                name, value, domain = CONSENT_COOKIE
+                self.session.cookies.set(name, value, domain=domain)
+                consent_retried = True
+                continue
+
+            if not is_throttled(response):
+                if self.rate_limiter:
+                    self.rate_limiter.on_success(host)
+                return response
+
+            self.stats.incr("throttled")
+            # Sans limiteur il n'y a pas de pause : retenter ne ferait qu'insister
+            if self.rate_limiter:
+                self.rate_limiter.on_throttle(host, retry_after(response))
+            if not self.rate_limiter or attempt >= self.max_retries:
+                raise ThrottledError(f"Débit limité par {host} (HTTP {response.status_code})", response=response)
+            attempt += 1
+            self.stats.incr("retries")
+
+    def _send(self, method, url, timeout, **kwargs):
+        self.stats.incr("requests")
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            self.stats.incr("errors")
+            raise
+        self.stats.incr("bytes_received", len(response.content))
+        return response
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,124 @@
+"""Représentation compacte des vidéos découvertes pendant le crawl"""
+
+import sys
+from datetime import datetime
+
+
+class VideoRecord:
+    """
+    Vidéo découverte, stockée dans des slots plutôt que dans un dict.
+
+    Seuls l'identifiant, le titre, les valeurs numériques (vues, durée,
+    timestamp de publication) et la chaîne (chaînes internées, partagées
+    entre toutes les vidéos d'une même chaîne) sont conservés ; l'URL, la
+    miniature et la date ISO sont reconstruites à la demande à partir des
+    bases de routes.json.
+
+    L'accès par clé (video['url'], video.get('views')...) reste celui des
+    anciens dicts, pour run.py, les filtres et la frontière.
+    """
+
+    __slots__ = ("videoId", "title", "channel", "channelId", "views", "duration",
+                 "publishedTimestamp", "_published_text", "is_short")
+
+    # Bases d'URL (routes.json), fixées par le crawler via set_routes
+    base_video_url = "https://www.youtube.com/watch?v="
+    base_shorts_url = "https://www.youtube.com/shorts/"
+    base_thumbnail_url = "https://i.ytimg.com/vi/"
+
+    KEYS = ("videoId", "title", "channel", "channelId", "views", "publishedTime",
+            "publishedTimestamp", "duration", "thumbnail", "url")
+
+    def __init__(self, videoId, title="", channel="", channelId="", views=0, duration=0,
+                 publishedTimestamp=None, published_text=None, is_short=False):
+        """
+        Args:
+            published_text (str): Date de publication d'origine, gardée seulement si
+                elle n'a pas pu être convertie en timestamp
+        """
+        self.videoId = videoId
+        self.title = title
+        self.channel = sys.intern(channel) if channel else ""
+        self.channelId = sys.intern(channelId) if channelId else ""
+        self.views = views
+        self.duration = duration
+        self.publishedTimestamp = publishedTimestamp
+        self._published_text = published_text if publishedTimestamp is None else None
+        self.is_short = is_short
+
+    @classmethod
+    def set_routes(cls, routes):
+        """Prend les bases d'URL de routes.json (section du site)"""
+        cls.base_video_url = routes.get("base_video_url", cls.base_video_url)
+        cls.base_shorts_url = routes.get("base_shorts_url", cls.base_shorts_url)
+        cls.base_thumbnail_url = routes.get("base_thumbnail_url", cls.base_thumbnail_url)
+
+    @property
+    def url(self):
+        if not self.videoId:
+            return ''
+        return (self.base_shorts_url if self.is_short else self.base_video_url) + self.videoId
+
+    @property
+    def thumbnail(self):
+        return f"{self.base_thumbnail_url}{self.videoId}/hqdefault.jpg" if self.videoId else ''
+
+    @property
+    def publishedTime(self):
+        """Date ISO (ou texte d'origine si la date n'a pas été reconnue)"""
+        if self.publishedTimestamp is None:
+            return self._published_text
+        return datetime.fromtimestamp(self.publishedTimestamp).isoformat()
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        """Dict complet (URL et miniature incluses), comme l'ancien format des vidéos"""
+        video = {key: getattr(self, key) for key in self.KEYS}
+        video["isShort"] = self.is_short
+        return video
+
+    @classmethod
+    def from_dict(cls, video):
+        """Reconstruit une vidéo depuis un dict (to_dict, point de reprise)"""
+        if isinstance(video, cls):
+            return video
+        is_short = video.get("isShort", "/shorts/" in (video.get("url") or ""))
+        return cls(video.get("videoId", ""), video.get("title", ""), video.get("channel", ""),
+                   video.get("channelId", ""), video.get("views", 0), video.get("duration", 0),
+                   video.get("publishedTimestamp"), video.get("publishedTime"), is_short)
+
+    def copy(self):
+        return VideoRecord(self.videoId, self.title, self.channel, self.channelId, self.views, self.duration,
+                           self.publishedTimestamp, self._published_text, self.is_short)
+
+    def __eq__(self, other):
+        if not isinstance(other, VideoRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"VideoRecord(videoId={self.videoId!r}, title={self.title!r}, views={self.views}, duration={self.duration})"
+
+
+def video_to_json(video):
+    """Sérialiseur `default` de json.dump pour les VideoRecord"""
+    if isinstance(video, VideoRecord):
+        return video.to_dict()
+    raise TypeError(f"Objet non sérialisable en JSON: {type(video).__name__}")
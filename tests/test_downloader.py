@@ -0,0 +1,51 @@
+"""Détection des téléchargements bloqués : l'extraction ne compte pas dans les délais"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from src.downloader import YouTubeDownloader
+
+
+class SlowExtractionDownloader(YouTubeDownloader):
+    """Extraction lente (page, player, signatures), puis transfert sain simulé par le hook"""
+
+    EXTRACTION_S = 1.5
+    TRANSFER_S = 1.5
+    CHUNK = 50_000
+    CHUNK_EVERY = 0.05  # 1 Mo/s
+
+    def _run(self, ydl_opts, video_url):
+        time.sleep(self.EXTRACTION_S)
+        path = os.path.join(self.download_dir, "video.mp4")
+        total = int(self.TRANSFER_S / self.CHUNK_EVERY) * self.CHUNK
+        downloaded = 0
+        while downloaded < total:
+            time.sleep(self.CHUNK_EVERY)
+            downloaded += self.CHUNK
+            self._progress_hook({"status": "downloading", "filename": path,
+                                 "downloaded_bytes": downloaded, "total_bytes": total})
+        with open(path, "wb") as f:
+            f.write(b"\0" * total)
+        self._progress_hook({"status": "finished", "filename": path, "total_bytes": total})
+        return {}, path
+
+
+class StallDetectionTest(unittest.TestCase):
+    def test_slow_extraction_then_healthy_transfer(self):
+        with tempfile.TemporaryDirectory() as download_dir:
+            downloader = SlowExtractionDownloader(download_dir, min_speed=500_000, stall_timeout=1,
+                                                  stall_retries=0, speed_window=1)
+            result = downloader.download("https://www.youtube.com/watch?v=aaaaaaaaaaa")
+
+            self.assertTrue(result["success"], result.get("error"))
+            stats = downloader.stats.snapshot()
+            self.assertEqual(stats["stalls"], 0)
+            self.assertEqual(stats["bytes"], result["bytes"])
+            # Délai avant le premier octet mesuré depuis le début du transfert, pas de l'extraction
+            self.assertLess(stats["max_ttfb_ms"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()